@@ -1,19 +1,26 @@
 """
 ADK agents for Azure RAG Agent system
 """
-from .classifier import create_classifier_agent
-from .planner import create_planner_agent
+from .classifier import CachingClassifierAgent, ClassificationOutput, create_classifier_agent
+from .classify_and_plan import create_classify_and_plan_agent
+from .planner import PlannerOutput, create_planner_agent
 from .synthesizer import create_synthesizer_agent
 from .reflection import create_reflection_agent
 from .executor import ToolExecutionAgent
 from .quality import QualityGateAgent, QualityCheckerAgent
+from .residual_planner import ResidualPlannerAgent
 
 __all__ = [
+    "CachingClassifierAgent",
+    "ClassificationOutput",
     "create_classifier_agent",
+    "create_classify_and_plan_agent",
+    "PlannerOutput",
     "create_planner_agent",
     "create_synthesizer_agent",
     "create_reflection_agent",
     "ToolExecutionAgent",
     "QualityGateAgent",
     "QualityCheckerAgent",
+    "ResidualPlannerAgent",
 ]
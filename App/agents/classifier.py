@@ -2,15 +2,29 @@
 Query classification agent
 Implements ADK LlmAgent for query intent and complexity classification
 """
-from google.adk.agents import LlmAgent
-from google.adk.models.lite_llm import LiteLlm
-from pydantic import BaseModel
+import logging
+from typing import Any
+
+from google.adk.agents import BaseAgent, LlmAgent
+from google.adk.events import Event
+from pydantic import BaseModel, ConfigDict
 
 from ..config import config
+from ..core import cache_key, cache_manager, get_llm
+
+logger = logging.getLogger(__name__)
 
 
 class ClassificationOutput(BaseModel):
-    """Pydantic model for the classifier's output."""
+    """
+    Pydantic model for the classifier's output.
+
+    Kept as a BaseModel because ADK's output_schema requires Pydantic;
+    frozen + extra='ignore' lets validation take the fast immutable path
+    and skip unknown-key bookkeeping on every LLM response.
+    """
+    model_config = ConfigDict(frozen=True, extra="ignore")
+
     intent: str
     complexity: str
     domain: str
@@ -27,17 +41,16 @@ def create_classifier_agent() -> LlmAgent:
     - Small, fast model (GPT-4o-mini) for low latency
     - Structured JSON output for deterministic parsing
     - Clear instruction for consistent classification
+    - Returns a fresh instance per call: ADK enforces a single parent
+      per agent, so pipelines must not share instances. The expensive
+      part (the LiteLlm wrapper) is cached inside get_llm
 
     Returns:
         LlmAgent configured for query classification
     """
     return LlmAgent(
         name="classifier",
-        model=LiteLlm(
-            model=f"azure/{config.GPT4O_MINI_DEPLOYMENT}",
-            api_base=config.OPENAI_ENDPOINT,
-            api_version=config.OPENAI_API_VERSION
-        ),
+        model=get_llm(config.GPT4O_MINI_DEPLOYMENT),
         description="Classifies queries into intent, complexity, and domain",
         instruction="""Classify the query:
 - intent: "lookup" (fact retrieval), "analysis" (data analysis), "generation" (create content)
@@ -49,3 +62,56 @@ Respond ONLY with JSON:
         output_schema=ClassificationOutput,
         output_key="classification"
     )
+
+
+class CachingClassifierAgent(BaseAgent):
+    """
+    Redis-backed cache in front of the classifier LlmAgent.
+
+    ADK Best Practice: Classification depends only on the query text, so
+    repeated queries should not pay the classifier round-trip inside
+    every workflow. Shares the "classifier" tool-cache namespace with
+    the API layer, so a hit at either layer serves both.
+
+    Pattern:
+    - Cache hit: seed session.state["classification"] and skip the LLM
+    - Cache miss: delegate to the wrapped agent, then write back
+    - config.NO_CACHE bypasses the cache entirely for A/B runs
+    """
+    delegate: LlmAgent
+
+    def __init__(self):
+        super().__init__(
+            name="CachingClassifier",
+            description="Classifies queries, reusing cached verdicts for repeat queries",
+            delegate=create_classifier_agent()
+        )
+
+    async def _run_async_impl(self, ctx: Any, **kwargs) -> Any:
+        """
+        Serve the classification from cache or delegate to the LlmAgent.
+
+        ADK Pattern: Deterministic short-circuit around an LLM sub-call.
+        """
+        session = ctx.session if hasattr(ctx, 'session') else ctx
+        query = session.state.get("query", "")
+        if config.NO_CACHE or not query:
+            async for event in self.delegate.run_async(ctx, **kwargs):
+                yield event
+            return
+
+        cls_hash = cache_key(query)
+        cached = await cache_manager.get_tool_result("classifier", cls_hash)
+        if cached:
+            session.state["classification"] = cached
+            yield Event(
+                author=self.name,
+                content="Classification served from cache"
+            )
+            return
+
+        async for event in self.delegate.run_async(ctx, **kwargs):
+            yield event
+        classification = session.state.get("classification")
+        if classification:
+            await cache_manager.set_tool_result("classifier", cls_hash, classification)
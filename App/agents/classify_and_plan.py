@@ -0,0 +1,79 @@
+"""
+Fused classification + planning agent
+Implements ADK LlmAgent emitting classification and strategy in one call
+"""
+from google.adk.agents import LlmAgent
+from pydantic import BaseModel, ConfigDict
+
+from ..config import config
+from ..core import get_llm
+from .classifier import ClassificationOutput
+from .planner import PlannerOutput
+
+
+class ClassifyPlanOutput(BaseModel):
+    """Pydantic model for the fused classifier + planner output."""
+    model_config = ConfigDict(frozen=True, extra="ignore")
+
+    classification: ClassificationOutput
+    strategy: PlannerOutput
+
+
+def create_classify_and_plan_agent() -> LlmAgent:
+    """
+    Create fused classification + planning agent.
+
+    ADK Best Practice: Fuse adjacent LLM stages with static prompts into
+    one call when the second stage only consumes the first stage's
+    output. Classification and planning are two sequential Azure OpenAI
+    round trips today; emitting both structures from a single GPT-4o-mini
+    call removes one full network round trip per query.
+
+    Pattern:
+    - Small, fast model (GPT-4o-mini) for low latency
+    - One structured JSON output carrying both classification and strategy
+    - Fresh instance per call (ADK allows one parent per agent); the
+      LiteLlm wrapper is still cached inside get_llm
+
+    Returns:
+        LlmAgent configured for fused classification + planning
+    """
+    return LlmAgent(
+        name="classify_and_plan",
+        model=get_llm(config.GPT4O_MINI_DEPLOYMENT),
+        description="Classifies the query and plans execution strategy in one call",
+        instruction="""Classify the query AND create its execution strategy: {query}
+
+Classification:
+- intent: "lookup" (fact retrieval), "analysis" (data analysis), "generation" (create content)
+- complexity: "simple" (1 source, direct), "medium" (2-3 sources), "complex" (4+ sources, synthesis)
+- domain: "finance", "ops", "hr", "general"
+
+Available tools:
+- azure_ai_search: Vector + BM25 hybrid search
+- cosmos_gremlin: Graph relationships
+- synapse_sql: Analytics queries
+- web_search: Current external info
+
+Strategy types:
+- direct: Single tool, simple lookup
+- multi-source: 2-3 tools for comprehensive answer
+- iterative: Sequential with refinement
+
+Execution modes:
+- sequential: Tools run in order
+- parallel: Independent tools run simultaneously
+
+Respond ONLY with JSON:
+{
+    "classification": {"intent": "...", "complexity": "...", "domain": "..."},
+    "strategy": {
+        "strategy_type": "direct|multi-source|iterative",
+        "tools": ["tool1", "tool2"],
+        "execution_mode": "sequential|parallel",
+        "reasoning": "brief explanation"
+    }
+}""",
+        output_schema=ClassifyPlanOutput,
+        output_key="classify_plan"
+    )
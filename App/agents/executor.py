@@ -4,17 +4,48 @@ Implements ADK BaseAgent for orchestrating tool calls with budget and circuit br
 """
 import logging
 import asyncio
-from typing import Any, Dict, List
+import sys
+from typing import Any, Callable, Dict, List
 
 from google.adk.agents import BaseAgent
 from google.adk.tools import BaseTool
 from google.adk.events import Event
 
-from ..core import circuit_breaker, CostMeter
+from ..core import circuit_breaker, CostMeter, cost_meter_pool
 from ..config import BUDGETS, config
 
 logger = logging.getLogger(__name__)
 
+# Quality thresholds snapshotted at import; the gate runs per tool result
+# so it should not re-read config attributes every call
+_MIN_RESULTS = int(config.MIN_RESULTS)
+_MIN_SOURCE_TYPES = int(config.MIN_SOURCE_TYPES)
+_MIN_CONFIDENCE = float(config.MIN_CONFIDENCE)
+
+# Per-tool result counters, shared with QualityGateAgent so the count
+# logic has a single source of truth. Keys are interned once so the dict
+# lookup hits the cached-hash pointer-compare fast path on every result.
+RESULT_COUNTERS: Dict[str, Callable[[Dict[str, Any]], int]] = {
+    sys.intern("azure_ai_search"): lambda r: len(r.get("docs", ())),
+    sys.intern("synapse_sql"): lambda r: len(r.get("rows", ())),
+    sys.intern("cosmos_gremlin"): lambda r: r.get("count", 0),
+    sys.intern("web_search"): lambda r: len(r.get("results", ())),
+}
+
+
+def _default_result_count(result: Dict[str, Any]) -> int:
+    """Fallback counter for tools without a dedicated entry"""
+    return result.get("count", 0)
+
+
+# Per-tool execution timeouts, resolved once at import
+_TOOL_TIMEOUTS: Dict[str, float] = {
+    "azure_ai_search": config.TIMEOUT_SEARCH,
+    "cosmos_gremlin": config.TIMEOUT_GRAPH,
+    "synapse_sql": config.TIMEOUT_SQL,
+    "web_search": config.TIMEOUT_WEB,
+}
+
 
 class ToolExecutionAgent(BaseAgent):
     """
@@ -31,12 +62,23 @@ class ToolExecutionAgent(BaseAgent):
     - Quality gate validation
     """
     tools: Dict[str, BaseTool]
+    timeouts: Dict[str, float]
+    default_execution_mode: str
 
-    def __init__(self, tools: Dict[str, BaseTool]):
+    def __init__(self, tools: Dict[str, BaseTool], default_execution_mode: str = "sequential"):
         super().__init__(
             name="executor",
             description="Executes tools with budget tracking and circuit breaking",
-            tools=tools
+            tools=tools,
+            # Resolve per-tool timeouts once at construction; the hot
+            # path then does a single dict lookup per execution
+            timeouts={
+                name: _TOOL_TIMEOUTS.get(name, config.TIMEOUT_SEARCH)
+                for name in tools
+            },
+            # Used when the planner's strategy omits execution_mode, so
+            # fan-out workflows parallelize even on a sparse plan
+            default_execution_mode=default_execution_mode
         )
 
     async def _run_async_impl(self, ctx: Any, **kwargs) -> Any:
@@ -51,20 +93,23 @@ class ToolExecutionAgent(BaseAgent):
         Yields:
             Event with execution status and metrics
         """
-        from google.adk.events import Event
-
         # Access session state (ADK pattern)
         session = ctx.session if hasattr(ctx, 'session') else ctx
         query = session.state.get("query", "")
         tenant_id = session.state.get("tenant_id", "")
-        strategy = session.state.get("strategy", {})
+        # The fused classify_and_plan agent stores both structures under
+        # one key; fall back to it when the split agents did not run
+        fused = session.state.get("classify_plan", {})
+        strategy = session.state.get("strategy") or fused.get("strategy", {})
 
         # Initialize budget if not already set
         if "cost_meter" not in session.state:
-            classification = session.state.get("classification", {})
+            classification = session.state.get("classification") or fused.get("classification", {})
             complexity = classification.get("complexity", "medium")
             budget_tier = BUDGETS.get(complexity, BUDGETS["medium"])
-            cost_meter = CostMeter(limit=budget_tier.total_usd)
+            # Pooled meters avoid a fresh allocation per query; the API
+            # layer releases them once the response is built
+            cost_meter = cost_meter_pool.acquire(budget_tier.total_usd)
             session.state["budget_tier"] = budget_tier
             session.state["cost_meter"] = cost_meter
             session.state["max_tools"] = budget_tier.max_tool_calls
@@ -73,34 +118,61 @@ class ToolExecutionAgent(BaseAgent):
             budget_tier = session.state.get("budget_tier")
 
         tools_to_run = strategy.get("tools", [])
-        execution_mode = strategy.get("execution_mode", "sequential")
+        execution_mode = strategy.get("execution_mode", self.default_execution_mode)
 
         all_results = []
         successful_results: List[Dict[str, Any]] = []
 
         # ADK Pattern: True parallel or sequential execution
         if execution_mode == "parallel":
-            # Parallel fan-out: Execute tools concurrently
+            # Parallel fan-out: Execute tools concurrently, bounded so a
+            # wide plan cannot burst every Azure backend at once
+            semaphore = asyncio.Semaphore(config.MAX_PARALLEL_TOOLS)
+
+            async def _bounded_execute(name: str) -> Dict[str, Any]:
+                async with semaphore:
+                    return await self._execute_tool(name, query, tenant_id, cost_meter, **kwargs)
+
             tasks = []
             for tool_name in tools_to_run:
                 if not cost_meter.allow_tool(budget_tier.max_tool_calls):
                     logger.warning(f"Budget limit reached, skipping {tool_name}")
                     break
                 if tool_name in self.tools and circuit_breaker.is_closed(tool_name):
-                    tasks.append(
-                        self._execute_tool(tool_name, query, tenant_id, cost_meter, **kwargs)
-                    )
-
-            # Fan-in: Gather results
-            gathered = await asyncio.gather(*tasks, return_exceptions=True)
-            for result in gathered:
-                if isinstance(result, Exception):
-                    logger.error(f"Tool execution exception: {result}")
-                    all_results.append({"status": "error", "error": str(result)})
-                else:
-                    all_results.append(result)
-                    if result.get("status") == "success":
-                        successful_results.append(result)
+                    tasks.append(asyncio.create_task(_bounded_execute(tool_name)))
+
+            # Fan-in: record results as they arrive so a slow tool never
+            # blocks a fast one, and stop early once quality thresholds
+            # are already met by the gathered evidence
+            for future in asyncio.as_completed(tasks):
+                try:
+                    result = await future
+                except asyncio.CancelledError:
+                    # Tool tasks cancelled by _cancel_pending surface here
+                    # and are safe to skip, but cancellation of the
+                    # executor itself (e.g. an abandoned speculative
+                    # workflow) must propagate or the pipeline keeps
+                    # running to completion while its canceller blocks
+                    if asyncio.current_task().cancelling():
+                        raise
+                    continue
+                except Exception as e:
+                    logger.error(f"Tool execution exception: {e}")
+                    all_results.append({"status": "error", "error": str(e)})
+                    continue
+                all_results.append(result)
+                if result.get("status") == "success":
+                    successful_results.append(result)
+                    if self._check_quality_gate(successful_results, self._average_confidence(successful_results)):
+                        self._cancel_pending(tasks)
+                        logger.info("Quality gate met early; cancelling remaining tool calls")
+                        continue
+                # Re-check the budget after every completion: a tool that
+                # just charged the meter can push the query over its limit
+                # while siblings are still in flight
+                if not cost_meter.allow_tool(budget_tier.max_tool_calls):
+                    self._cancel_pending(tasks)
+                    logger.warning("Budget exhausted mid fan-out; cancelling remaining tool calls")
         else:
             # Sequential execution
             for tool_name in tools_to_run:
@@ -113,25 +185,36 @@ class ToolExecutionAgent(BaseAgent):
                     all_results.append(result)
                     if result.get("status") == "success":
                         successful_results.append(result)
-
-        # Collect and render context
-        context_items = self._collect_context(successful_results)
-        context_str = self._render_context(context_items)
-        avg_confidence = self._average_confidence(successful_results)
+                        # Same early exit the fan-out path takes: once the
+                        # evidence already clears the gate, further tools
+                        # only add latency and cost
+                        if self._check_quality_gate(successful_results, self._average_confidence(successful_results)):
+                            logger.info("Quality gate met early; skipping remaining sequential tools")
+                            break
+
+        # Summarize successful results in a single pass: context items,
+        # rendered context, item counts, confidence, and source types
+        summary = self._summarize_results(successful_results)
+        context_items, context_str, total_items, avg_confidence, source_types = summary
 
         # Update session state
+        source_type_list = list(source_types)
         session.state["tool_results"] = all_results
         session.state["context_items"] = context_items
         session.state["context"] = context_str
         session.state["result_metrics"] = {
-            "total_items": sum(self._result_count(r) for r in successful_results),
+            "total_items": total_items,
             "average_confidence": avg_confidence,
-            "source_types": list({r.get("tool_name") for r in successful_results})
+            "source_types": source_type_list
         }
-        session.state["num_sources"] = session.state["result_metrics"]["total_items"]
+        session.state["num_sources"] = total_items
         session.state["avg_confidence"] = avg_confidence
-        session.state["source_types"] = session.state["result_metrics"]["source_types"]
-        session.state["quality_passed"] = self._check_quality_gate(successful_results, avg_confidence)
+        session.state["source_types"] = source_type_list
+        session.state["quality_passed"] = (
+            total_items >= _MIN_RESULTS
+            and len(source_types) >= _MIN_SOURCE_TYPES
+            and avg_confidence >= _MIN_CONFIDENCE
+        )
 
         # ADK pattern: yield event with state updates
         yield Event(
@@ -160,14 +243,8 @@ class ToolExecutionAgent(BaseAgent):
                 logger.warning(f"Circuit open for {tool_name}")
                 return {"status": "circuit_open", "tool_name": tool_name}
 
-            # Determine timeout based on tool type
-            timeout_map = {
-                "azure_ai_search": config.TIMEOUT_SEARCH,
-                "cosmos_gremlin": config.TIMEOUT_GRAPH,
-                "synapse_sql": config.TIMEOUT_SQL,
-                "web_search": config.TIMEOUT_WEB
-            }
-            timeout = timeout_map.get(tool_name, config.TIMEOUT_SEARCH)
+            # Timeout resolved once at agent construction
+            timeout = self.timeouts.get(tool_name, config.TIMEOUT_SEARCH)
 
             # Execute tool with timeout
             result = await asyncio.wait_for(
@@ -200,58 +277,65 @@ class ToolExecutionAgent(BaseAgent):
             circuit_breaker.record_failure(tool_name)
             return {"status": "error", "tool_name": tool_name, "error": str(e)}
 
+    @staticmethod
+    def _cancel_pending(tasks: List["asyncio.Task"]):
+        """Cancel every task in the fan-out that has not finished yet"""
+        for task in tasks:
+            if not task.done():
+                task.cancel()
+
     def _check_quality_gate(self, successful_results: List[Dict], avg_confidence: float) -> bool:
         """Check if results meet quality thresholds"""
         total_items = sum(self._result_count(r) for r in successful_results)
-        if total_items < config.MIN_RESULTS:
-            return False
-
         source_types = {r.get("tool_name", "") for r in successful_results if r.get("tool_name")}
-        if len(source_types) < config.MIN_SOURCE_TYPES:
-            return False
-
-        if avg_confidence < config.MIN_CONFIDENCE:
-            return False
+        return (
+            total_items >= _MIN_RESULTS
+            and len(source_types) >= _MIN_SOURCE_TYPES
+            and avg_confidence >= _MIN_CONFIDENCE
+        )
 
-        return True
+    def _summarize_results(self, results: List[Dict[str, Any]]) -> tuple:
+        """
+        Summarize successful tool results in one pass.
 
-    def _collect_context(self, results: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-        """Flatten context items from tool responses"""
+        Builds the context_items list, the prompt-ready context string,
+        the total item count, the blended confidence, and the set of
+        source types as running accumulators instead of re-walking the
+        results once per metric.
+        """
         items: List[Dict[str, Any]] = []
+        lines: List[str] = []
+        idx = 0
+        total_items = 0
+        conf_sum = 0.0
+        conf_n = 0
+        source_types = set()
         for result in results:
-            for item in result.get("context_items", []) or []:
+            tool_name = result.get("tool_name")
+            if tool_name:
+                source_types.add(tool_name)
+            total_items += RESULT_COUNTERS.get(tool_name, _default_result_count)(result)
+            confidence = result.get("average_confidence")
+            if confidence is not None:
+                conf_sum += confidence
+                conf_n += 1
+            for item in result.get("context_items", ()) or ():
                 if "source" not in item:
-                    item["source"] = result.get("tool_name")
+                    item["source"] = tool_name
                 items.append(item)
-        return items
-
-    def _render_context(self, items: List[Dict[str, Any]]) -> str:
-        """Render context snippets into prompt-ready text"""
-        if not items:
-            return ""
-        lines: List[str] = []
-        for idx, item in enumerate(items, 1):
-            source = item.get("source", "tool")
-            identifier = item.get("id")
-            content = item.get("content", "")
-            prefix = f"[{idx}] ({source})"
-            if identifier:
-                prefix = f"{prefix} {identifier}"
-            lines.append(f"{prefix}: {content}")
-        return "\n".join(lines)
+                idx += 1
+                source = item.get("source", "tool")
+                identifier = item.get("id")
+                prefix = f"[{idx}] ({source})"
+                if identifier:
+                    prefix = f"{prefix} {identifier}"
+                lines.append(f"{prefix}: {item.get('content', '')}")
+        avg_confidence = conf_sum / conf_n if conf_n else 0.0
+        return items, "\n".join(lines), total_items, avg_confidence, source_types
 
     def _result_count(self, result: Dict[str, Any]) -> int:
         """Determine how many unique items a tool returned"""
-        tool_name = result.get("tool_name")
-        if tool_name == "azure_ai_search":
-            return len(result.get("docs", []))
-        if tool_name == "synapse_sql":
-            return len(result.get("rows", []))
-        if tool_name == "cosmos_gremlin":
-            return result.get("count", 0)
-        if tool_name == "web_search":
-            return len(result.get("results", []))
-        return result.get("count", 0)
+        return RESULT_COUNTERS.get(result.get("tool_name"), _default_result_count)(result)
 
     def _average_confidence(self, results: List[Dict[str, Any]]) -> float:
         """Blend confidence scores across tools"""
@@ -3,15 +3,60 @@ Strategy planning agent
 Implements ADK LlmAgent for execution strategy planning
 """
 from google.adk.agents import LlmAgent
-from google.adk.models.lite_llm import LiteLlm
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 from typing import List
 
 from ..config import config
+from ..core import get_llm
+
+
+# Tool catalog rendered once at import; the instruction template below
+# is frozen so the planner prompt is never rebuilt per call
+TOOL_DESCRIPTIONS = "\n".join(
+    f"- {name}: {description}"
+    for name, description in (
+        ("azure_ai_search", "Vector + BM25 hybrid search"),
+        ("cosmos_gremlin", "Graph relationships"),
+        ("synapse_sql", "Analytics queries"),
+        ("web_search", "Current external info"),
+    )
+)
+
+INSTRUCTION_TEMPLATE = f"""Create execution strategy for the query: {{query}}
+
+Classification: {{classification}}
+Max tools allowed: {{max_tools}}
+
+Available tools:
+{TOOL_DESCRIPTIONS}
+
+Strategy types:
+- direct: Single tool, simple lookup
+- multi-source: 2-3 tools for comprehensive answer
+- iterative: Sequential with refinement
+
+Execution modes:
+- sequential: Tools run in order
+- parallel: Independent tools run simultaneously
+
+Respond ONLY with JSON:
+{{
+    "strategy_type": "direct|multi-source|iterative",
+    "tools": ["tool1", "tool2"],
+    "execution_mode": "sequential|parallel",
+    "reasoning": "brief explanation"
+}}"""
 
 
 class PlannerOutput(BaseModel):
-    """Pydantic model for the planner's output."""
+    """
+    Pydantic model for the planner's output.
+
+    Kept as a BaseModel because ADK's output_schema requires Pydantic;
+    frozen + extra='ignore' keeps per-response validation lean.
+    """
+    model_config = ConfigDict(frozen=True, extra="ignore")
+
     strategy_type: str
     tools: List[str]
     execution_mode: str
@@ -29,45 +74,17 @@ def create_planner_agent() -> LlmAgent:
     - Powerful model (GPT-4o) for strategic reasoning
     - Structured output for workflow orchestration
     - Budget-aware planning with tool selection
+    - Fresh instance per call (ADK allows one parent per agent); the
+      LiteLlm wrapper and prompt template are still built once
 
     Returns:
         LlmAgent configured for strategy planning
     """
     return LlmAgent(
         name="planner",
-        model=LiteLlm(
-            model=f"azure/{config.GPT4O_DEPLOYMENT}",
-            api_base=config.OPENAI_ENDPOINT,
-            api_version=config.OPENAI_API_VERSION
-        ),
+        model=get_llm(config.GPT4O_DEPLOYMENT),
         description="Creates execution strategy within budget constraints",
-        instruction="""Create execution strategy for the query: {query}
-
-Classification: {classification}
-Max tools allowed: {max_tools}
-
-Available tools:
-- azure_ai_search: Vector + BM25 hybrid search
-- cosmos_gremlin: Graph relationships
-- synapse_sql: Analytics queries
-- web_search: Current external info
-
-Strategy types:
-- direct: Single tool, simple lookup
-- multi-source: 2-3 tools for comprehensive answer
-- iterative: Sequential with refinement
-
-Execution modes:
-- sequential: Tools run in order
-- parallel: Independent tools run simultaneously
-
-Respond ONLY with JSON:
-{
-    "strategy_type": "direct|multi-source|iterative",
-    "tools": ["tool1", "tool2"],
-    "execution_mode": "sequential|parallel",
-    "reasoning": "brief explanation"
-}""",
+        instruction=INSTRUCTION_TEMPLATE,
         output_schema=PlannerOutput,
         output_key="strategy"
     )
@@ -9,9 +9,16 @@ from google.adk.agents import BaseAgent
 from google.adk.events import Event, EventActions
 
 from ..config import config
+from .executor import RESULT_COUNTERS, _default_result_count
 
 logger = logging.getLogger(__name__)
 
+# Quality thresholds snapshotted at import so the per-request gate does
+# not re-read config attributes
+_MIN_RESULTS = int(config.MIN_RESULTS)
+_MIN_SOURCE_TYPES = int(config.MIN_SOURCE_TYPES)
+_MIN_CONFIDENCE = float(config.MIN_CONFIDENCE)
+
 
 class QualityGateAgent(BaseAgent):
     """
@@ -39,16 +46,31 @@ class QualityGateAgent(BaseAgent):
         ADK Pattern: Access session state, perform validation,
         update state, yield Event.
         """
-        from google.adk.events import Event
-
         session = ctx.session if hasattr(ctx, 'session') else ctx
-        tool_results = session.state.get("tool_results", [])
 
-        # Check quality thresholds
-        successful_results = [r for r in tool_results if r.get("status") == "success"]
-        num_sources = sum(self._result_count(r) for r in successful_results)
-        avg_confidence = self._average_confidence(successful_results)
-        num_source_types = len({r.get("tool_name") for r in successful_results if r.get("tool_name")})
+        # Prefer the metrics the executor already computed in its single
+        # summary pass; recompute from tool_results only when the gate
+        # runs without an executor upstream
+        metrics = session.state.get("result_metrics")
+        if metrics is not None:
+            num_sources = metrics.get("total_items", 0)
+            avg_confidence = metrics.get("average_confidence", 0.0)
+            num_source_types = len(metrics.get("source_types", ()))
+        else:
+            tool_results = session.state.get("tool_results", [])
+            successful_results = [r for r in tool_results if r.get("status") == "success"]
+            num_sources = sum(self._result_count(r) for r in successful_results)
+            avg_confidence = self._average_confidence(successful_results)
+            num_source_types = len({r.get("tool_name") for r in successful_results if r.get("tool_name")})
+
+        # In the residual-refinement loop, fold this pass's findings into
+        # the running accumulated set and gate on the merged evidence -
+        # a later pass that only fills a small gap must not fail the
+        # thresholds just because its own slice is thin
+        if session.state.get("accumulated_findings") is not None:
+            num_sources, avg_confidence, num_source_types = self._merge_accumulated(
+                session, num_sources, avg_confidence
+            )
 
         session.state["num_sources"] = num_sources
         session.state["avg_confidence"] = avg_confidence
@@ -56,9 +78,9 @@ class QualityGateAgent(BaseAgent):
 
         # Quality gate logic
         quality_passed = (
-            num_sources >= config.MIN_RESULTS and
-            avg_confidence >= config.MIN_CONFIDENCE and
-            num_source_types >= config.MIN_SOURCE_TYPES
+            num_sources >= _MIN_RESULTS and
+            avg_confidence >= _MIN_CONFIDENCE and
+            num_source_types >= _MIN_SOURCE_TYPES
         )
 
         session.state["quality_passed"] = quality_passed
@@ -68,18 +90,61 @@ class QualityGateAgent(BaseAgent):
             content=f"Quality check: {'PASSED' if quality_passed else 'FAILED'} (sources={num_sources}, confidence={avg_confidence:.2f}, types={num_source_types})"
         )
 
+    def _merge_accumulated(self, session: Any, num_sources: int, avg_confidence: float) -> tuple:
+        """
+        Merge this pass's findings into the accumulated refinement state.
+
+        Dedupes context items by (source, id), marks tools that returned
+        results as resolved so ResidualPlannerAgent drops them from the
+        next pass, and re-exposes the merged evidence through
+        context_items / context for the reflector and synthesizer.
+
+        Returns:
+            Tuple of merged (num_sources, avg_confidence, num_source_types)
+        """
+        state = session.state
+        accumulated = state["accumulated_findings"]
+        seen = {(item.get("source"), item.get("id")) for item in accumulated}
+        for item in state.get("context_items", ()) or ():
+            key = (item.get("source"), item.get("id"))
+            if key not in seen:
+                seen.add(key)
+                accumulated.append(item)
+
+        resolved = state.setdefault("resolved_tools", [])
+        for result in state.get("tool_results", ()) or ():
+            tool_name = result.get("tool_name")
+            if (
+                result.get("status") == "success"
+                and tool_name
+                and tool_name not in resolved
+                and self._result_count(result) > 0
+            ):
+                resolved.append(tool_name)
+
+        totals = state.setdefault(
+            "accumulated_metrics",
+            {"total_items": 0, "conf_sum": 0.0, "conf_n": 0, "source_types": []}
+        )
+        totals["total_items"] += num_sources
+        if avg_confidence:
+            totals["conf_sum"] += avg_confidence
+            totals["conf_n"] += 1
+        source_types = set(totals["source_types"]) | set(state.get("source_types", ()) or ())
+        totals["source_types"] = list(source_types)
+
+        state["context_items"] = accumulated
+        state["context"] = "\n".join(
+            f"[{idx}] ({item.get('source', 'tool')}): {item.get('content', '')}"
+            for idx, item in enumerate(accumulated, 1)
+        )
+
+        merged_confidence = totals["conf_sum"] / totals["conf_n"] if totals["conf_n"] else 0.0
+        return totals["total_items"], merged_confidence, len(source_types)
+
     def _result_count(self, result: Dict[str, Any]) -> int:
         """Determine how many unique items a tool returned"""
-        tool_name = result.get("tool_name")
-        if tool_name == "azure_ai_search":
-            return len(result.get("docs", []))
-        if tool_name == "synapse_sql":
-            return len(result.get("rows", []))
-        if tool_name == "cosmos_gremlin":
-            return result.get("count", 0)
-        if tool_name == "web_search":
-            return len(result.get("results", []))
-        return result.get("count", 0)
+        return RESULT_COUNTERS.get(result.get("tool_name"), _default_result_count)(result)
 
     def _average_confidence(self, results: List[Dict[str, Any]]) -> float:
         """Blend confidence scores across tools"""
@@ -116,8 +181,6 @@ class QualityCheckerAgent(BaseAgent):
 
         ADK Pattern: Use EventActions(escalate=True) to exit LoopAgent.
         """
-        from google.adk.events import Event, EventActions
-
         session = ctx.session if hasattr(ctx, 'session') else ctx
         quality_passed = session.state.get("quality_passed", False)
         reflection = session.state.get("reflection", {})
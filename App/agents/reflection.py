@@ -2,10 +2,27 @@
 Quality reflection agent
 Implements ADK LlmAgent for result sufficiency evaluation
 """
+from typing import List
+
 from google.adk.agents import LlmAgent
-from google.adk.models.lite_llm import LiteLlm
+from pydantic import BaseModel, ConfigDict
 
 from ..config import config
+from ..core import get_llm
+
+
+class ReflectionOutput(BaseModel):
+    """
+    Pydantic model for the reflector's output.
+
+    A typed model instead of a raw dict schema keeps all agents on the
+    same (faster) Pydantic validation path inside ADK.
+    """
+    model_config = ConfigDict(frozen=True, extra="ignore")
+
+    evaluation: str
+    gaps: List[str]
+    reasoning: str
 
 
 def create_reflection_agent() -> LlmAgent:
@@ -19,17 +36,15 @@ def create_reflection_agent() -> LlmAgent:
     - Small model (GPT-4o-mini) for fast evaluation
     - Structured output for loop control decisions
     - Gap identification for targeted refinement
+    - Fresh instance per call (ADK allows one parent per agent); the
+      LiteLlm wrapper is still cached inside get_llm
 
     Returns:
         LlmAgent configured for quality reflection
     """
     return LlmAgent(
         name="reflector",
-        model=LiteLlm(
-            model=f"azure/{config.GPT4O_MINI_DEPLOYMENT}",
-            api_base=config.OPENAI_ENDPOINT,
-            api_version=config.OPENAI_API_VERSION
-        ),
+        model=get_llm(config.GPT4O_MINI_DEPLOYMENT),
         description="Evaluates result sufficiency",
         instruction="""Evaluate if results are sufficient to answer the query.
 
@@ -44,13 +59,6 @@ Respond with JSON:
     "gaps": ["gap1", "gap2"],
     "reasoning": "explanation"
 }""",
-        output_schema={
-            "type": "object",
-            "properties": {
-                "evaluation": {"type": "string"},
-                "gaps": {"type": "array"},
-                "reasoning": {"type": "string"}
-            }
-        },
+        output_schema=ReflectionOutput,
         output_key="reflection"
     )
@@ -0,0 +1,79 @@
+"""
+Residual planner agent
+Implements ADK BaseAgent for narrowing refinement passes to unresolved work
+"""
+import logging
+from typing import Any
+
+from google.adk.agents import BaseAgent
+from google.adk.events import Event, EventActions
+
+logger = logging.getLogger(__name__)
+
+
+class ResidualPlannerAgent(BaseAgent):
+    """
+    Narrows each refinement iteration to the residual gap.
+
+    ADK Best Practice: Inside a LoopAgent, avoid re-executing work that
+    already succeeded. Re-running the full plan every iteration re-pays
+    every tool call for evidence the loop already holds.
+
+    Pattern:
+    - First pass: initialize accumulated_findings / resolved_tools state
+      and let the full plan run
+    - Later passes: drop tools that already produced results (tracked by
+      QualityGateAgent in resolved_tools) from the strategy, so the
+      executor only fills the remaining gap
+    """
+
+    def __init__(self):
+        super().__init__(
+            name="ResidualPlanner",
+            description="Targets refinement iterations at unresolved tools only"
+        )
+
+    async def _run_async_impl(self, ctx: Any, **kwargs) -> Any:
+        """
+        Shrink the strategy to the unresolved residual.
+
+        ADK Pattern: Deterministic state rewrite, no LLM call.
+        """
+        session = ctx.session if hasattr(ctx, 'session') else ctx
+        fused = session.state.get("classify_plan", {})
+        strategy = session.state.get("strategy") or fused.get("strategy", {})
+
+        if session.state.get("accumulated_findings") is None:
+            # First iteration: run the full plan and start accumulating
+            session.state["accumulated_findings"] = []
+            session.state["resolved_tools"] = []
+            session.state["unresolved_subqueries"] = list(strategy.get("tools", ()))
+            yield Event(
+                author=self.name,
+                content="Initial pass: executing full plan"
+            )
+            return
+
+        resolved = set(session.state.get("resolved_tools", ()))
+        planned = strategy.get("tools", [])
+        residual = [tool for tool in planned if tool not in resolved]
+        session.state["unresolved_subqueries"] = residual
+        session.state["strategy"] = {**strategy, "tools": residual}
+
+        if not residual:
+            # Nothing left to execute: a further pass would run a
+            # zero-tool executor plus a reflection LLM call per
+            # remaining iteration for no new evidence. Escalate so the
+            # LoopAgent exits now (same mechanism QualityCheckerAgent
+            # uses when the evidence is sufficient).
+            yield Event(
+                author=self.name,
+                content="All planned tools resolved; ending refinement loop",
+                actions=EventActions(escalate=True)
+            )
+            return
+
+        yield Event(
+            author=self.name,
+            content=f"Residual pass: {len(residual)} of {len(planned)} planned tools unresolved"
+        )
@@ -3,9 +3,9 @@ Response synthesis agent
 Implements ADK LlmAgent for final answer generation
 """
 from google.adk.agents import LlmAgent
-from google.adk.models.lite_llm import LiteLlm
 
 from ..config import config
+from ..core import get_llm
 
 
 def create_synthesizer_agent() -> LlmAgent:
@@ -19,17 +19,15 @@ def create_synthesizer_agent() -> LlmAgent:
     - Powerful model (GPT-4o) for high-quality synthesis
     - Context-grounded generation with citations
     - Clear guidelines for factual, helpful responses
+    - Fresh instance per call (ADK allows one parent per agent); the
+      LiteLlm wrapper is still cached inside get_llm
 
     Returns:
         LlmAgent configured for response synthesis
     """
     return LlmAgent(
         name="synthesizer",
-        model=LiteLlm(
-            model=f"azure/{config.GPT4O_DEPLOYMENT}",
-            api_base=config.OPENAI_ENDPOINT,
-            api_version=config.OPENAI_API_VERSION
-        ),
+        model=get_llm(config.GPT4O_DEPLOYMENT, stream=True),
         description="Synthesizes final response with citations",
         instruction="""Synthesize a response using the retrieved context.
 
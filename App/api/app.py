@@ -2,13 +2,15 @@
 FastAPI application for Azure RAG Agent
 Implements REST API with ADK workflow orchestration
 """
+import asyncio
 import logging
-import time
-import hashlib
+import unicodedata
+from time import time as _now
 from typing import Dict, Any
 
+import orjson
 from fastapi import FastAPI, HTTPException
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse, Response, StreamingResponse
 from azure.monitor.opentelemetry import configure_azure_monitor
 from opentelemetry import trace
 
@@ -16,11 +18,20 @@ from google.adk.sessions import Session
 
 from .models import QueryRequest, QueryResponse
 from ..config import config
-from ..core import get_clients, cache_manager
+from ..core import (
+    get_clients,
+    cache_manager,
+    cache_key,
+    semantic_cache,
+    cost_meter_pool,
+    close_http_client,
+)
 from ..tools import AzureAISearchTool, CosmosGremlinTool, SynapseSQLTool, WebSearchTool
 from ..agents import create_classifier_agent
+from ..agents.executor import RESULT_COUNTERS, _default_result_count
 from ..workflows import (
     create_sequential_pipeline,
+    create_direct_lookup_pipeline,
     create_parallel_fanout_gather,
     create_iterative_refinement,
 )
@@ -32,7 +43,8 @@ logger = logging.getLogger(__name__)
 app = FastAPI(
     title="Azure RAG Agent API",
     description="Production RAG agent using Google ADK with Azure services",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=ORJSONResponse
 )
 
 # Configure OpenTelemetry for Azure Monitor
@@ -44,6 +56,36 @@ if config.APP_INSIGHTS_CONNECTION_STRING:
 
 tracer = trace.get_tracer(__name__)
 
+
+@app.on_event("startup")
+async def _warm_clients():
+    """
+    Warm Azure clients before the first request.
+
+    Cold scale-out otherwise pays for client bootstrap, Azure AD token
+    acquisition, and the Redis TLS handshake inside the first user
+    request, which shows up as multi-second p99.
+    """
+    try:
+        clients = get_clients()
+        redis_client = await clients.get_redis()
+        await redis_client.ping()
+        await asyncio.to_thread(
+            clients.credential.get_token,
+            "https://cognitiveservices.azure.com/.default"
+        )
+        await clients.openai_client.models.list()
+        logger.info("Azure clients warmed at startup")
+    except Exception as e:
+        # Warmup is best-effort; the lazy paths still work per request
+        logger.warning(f"Client warmup failed: {e}")
+
+
+@app.on_event("shutdown")
+async def _close_http_client():
+    """Drain the shared outbound HTTP connection pool on shutdown"""
+    await close_http_client()
+
 # Initialize tools (shared across all workflows)
 # ADK Best Practice: Reuse tool instances across requests
 tools = {
@@ -53,8 +95,45 @@ tools = {
     "web_search": WebSearchTool(name=WebSearchTool.name, description=WebSearchTool.description)
 }
 
+# Build each workflow and the classifier once at import: agent
+# construction allocates prompt strings, tool schemas, and LLM adapters,
+# and all per-request state travels in the Session, so one instance per
+# pipeline is safe to reuse across concurrent run_async calls. Each
+# pipeline owns its sub-agent instances - ADK enforces a single parent
+# per agent, so the factories deliberately never share them
+# (see tests/test_workflows.py)
+_WORKFLOWS = {
+    "direct": create_direct_lookup_pipeline(tools),
+    "simple": create_sequential_pipeline(tools),
+    "medium": create_parallel_fanout_gather(tools),
+    # Classifier-free medium variant for speculation: the standalone
+    # classifier already runs concurrently on that path, so the
+    # speculated pipeline must not issue a second classifier call
+    "medium_spec": create_parallel_fanout_gather(tools, with_classifier=False),
+    "complex": create_iterative_refinement(tools),
+}
+_CLASSIFIER = create_classifier_agent()
+
+# Workflow-selection dispatch table: one dict lookup per request instead
+# of an if/elif ladder with per-branch string interpolation
+_WF_TABLE = {
+    "simple": (_WORKFLOWS["simple"], "Selected Sequential Pipeline for simple query"),
+    "medium": (_WORKFLOWS["medium"], "Selected Parallel Fan-Out/Gather for medium query"),
+    "complex": (_WORKFLOWS["complex"], "Selected Iterative Refinement for complex query"),
+}
+
+# Classification seeded into the speculative session: the planner
+# instruction requires {classification} in state, and the real verdict
+# is not back yet when speculation starts. Copied per request so a
+# workflow mutating its state cannot bleed into the next speculation.
+_PROVISIONAL_MEDIUM = {
+    "intent": "analysis",
+    "complexity": "medium",
+    "domain": "general",
+}
+
 # Default workflow (dynamically selected per query)
-root_agent = create_sequential_pipeline(tools)
+root_agent = _WORKFLOWS["simple"]
 
 
 @app.post("/query", response_model=QueryResponse)
@@ -84,102 +163,293 @@ async def process_query(request: QueryRequest):
     Raises:
         HTTPException: On content safety violation or processing error
     """
-    start_time = time.time()
+    start_time = _now()
+
+    # Normalize the query before hashing so trivially different
+    # spellings of the same question (case, whitespace, trailing
+    # punctuation, Unicode forms) land on the same cache entry
+    norm_query = " ".join(
+        unicodedata.normalize("NFKC", request.query).lower().split()
+    ).rstrip("?.! ")
 
     # Check response cache
-    query_hash = hashlib.md5(f"{request.query}:{request.tenant_id}".encode()).hexdigest()
+    query_hash = cache_key(norm_query, request.tenant_id, request.user_tier)
     cached_response = await cache_manager.get_response(query_hash)
     if cached_response:
-        import json
         logger.info(f"Response cache hit: {query_hash[:8]}")
-        return JSONResponse(json.loads(cached_response))
-
-    # Initialize ADK session with query context
-    # ADK Best Practice: Use Session to maintain state across agent calls
-    session = Session(user_id=request.tenant_id)
-    session.state.update({
-        "query": request.query,
-        "tenant_id": request.tenant_id,
-        "session_id": request.session_id,
-        "user_tier": request.user_tier
-    })
-
+        # Cached payload is already serialized JSON; hand the bytes
+        # straight back instead of parse-then-reserialize
+        return Response(content=cached_response, media_type="application/json")
+
+    # Check semantic cache for similar queries
+    # ADK Best Practice: Semantically similar queries can reuse the full
+    # cached response, skipping every LLM call in the workflow
+    query_vector = None
+    try:
+        query_vector = await semantic_cache.embed_query(request.query)
+        semantic_hit = await semantic_cache.get(request.tenant_id, query_vector)
+        if semantic_hit:
+            return Response(content=semantic_hit, media_type="application/json")
+    except Exception as e:
+        logger.warning(f"Semantic cache lookup failed: {e}")
+
+    # Singleflight: if an identical query is already being processed,
+    # await its result instead of running the workflow a second time.
+    # This bounds a thundering herd on a popular query to exactly one
+    # workflow execution at a time.
+    inflight = _INFLIGHT.get(query_hash)
+    if inflight is not None:
+        logger.info(f"Joining in-flight request: {query_hash[:8]}")
+        return await inflight
+    inflight = asyncio.get_running_loop().create_future()
+
+    speculative_task = None
+    spec_session = None
+    session = None
     try:
+        # Register only inside the try: a raise between registration and
+        # the handlers below would otherwise leave a permanently
+        # unresolved future that every joined waiter blocks on forever
+        _INFLIGHT[query_hash] = inflight
+
+        # Initialize ADK session with query context
+        # ADK Best Practice: Use Session to maintain state across agent calls
+        session = _acquire_session(request.tenant_id)
+        session.state.update({
+            "query": request.query,
+            "tenant_id": request.tenant_id,
+            "session_id": request.session_id,
+            "user_tier": request.user_tier
+        })
+
         # Step 1: Run classifier to determine complexity
         # ADK Pattern: Run individual agent for classification
-        classifier_agent = create_classifier_agent()
-        await classifier_agent.run_async(session, input=request.query)
+        # Classification depends only on the query text, so a keyed cache
+        # on the normalized query skips the classifier LLM call even when
+        # the tenant-scoped response cache misses
+        cls_hash = cache_key(norm_query)
+        cached_cls = await cache_manager.get_tool_result("classifier", cls_hash)
+        if cached_cls:
+            session.state["classification"] = cached_cls
+        else:
+            # Speculatively start the default (medium) workflow while the
+            # classifier round-trip is in flight; if the verdict differs
+            # we cancel it and the misclassification cost is one wasted
+            # retrieval, far cheaper than serializing LLM RTT + workflow.
+            # The classifier-free variant is used because _CLASSIFIER is
+            # already classifying this query concurrently. The speculation
+            # runs on its own session: the planner instruction requires
+            # {classification}, which the real session does not have yet,
+            # and two concurrent run_async calls must not interleave
+            # writes into one Session's state and event history. Its
+            # results are merged back only if the verdict confirms medium.
+            cls_task = asyncio.create_task(
+                _CLASSIFIER.run_async(session, input=request.query)
+            )
+            spec_session = _acquire_session(request.tenant_id)
+            spec_session.state.update({
+                "query": request.query,
+                "tenant_id": request.tenant_id,
+                "session_id": request.session_id,
+                "user_tier": request.user_tier,
+                "classification": dict(_PROVISIONAL_MEDIUM)
+            })
+            speculative_task = asyncio.create_task(
+                _WORKFLOWS["medium_spec"].run_async(spec_session, input=request.query)
+            )
+            await cls_task
+            classification = session.state.get("classification")
+            if classification:
+                await cache_manager.set_tool_result("classifier", cls_hash, classification)
         classification = session.state.get("classification", {})
         complexity = classification.get("complexity", "medium")
+        intent = classification.get("intent", "")
 
         # Step 2: Select appropriate workflow based on complexity
         # ADK Best Practice: Dynamic workflow selection for optimal performance
-        if complexity == "simple":
-            selected_agent = create_sequential_pipeline(tools)
-            logger.info("Selected Sequential Pipeline for simple query")
-        elif complexity == "complex":
-            selected_agent = create_iterative_refinement(tools)
-            logger.info("Selected Iterative Refinement for complex query")
-        else:  # medium
-            selected_agent = create_parallel_fanout_gather(tools)
-            logger.info("Selected Parallel Fan-Out/Gather for medium query")
+        selected_agent = None
+        if complexity == "simple" and intent == "lookup":
+            await _cancel_speculative(speculative_task)
+            # Fast path: classification already determines the plan, so
+            # seed the direct strategy and skip the planner LLM call
+            session.state["strategy"] = {
+                "strategy_type": "direct",
+                "tools": ["azure_ai_search"],
+                "execution_mode": "sequential",
+                "reasoning": "Simple lookup fast path"
+            }
+            selected_agent = _WORKFLOWS["direct"]
+            logger.info("Selected Direct Lookup fast path for simple query")
+        elif complexity == "medium" and speculative_task is not None:
+            # The speculative run already matches; wait for it and adopt
+            # its results. The provisional classification is skipped in
+            # the merge - the real session already holds the verdict
+            await speculative_task
+            session.state.update(
+                (key, value)
+                for key, value in spec_session.state.items()
+                if key != "classification"
+            )
+            logger.info("Speculative Parallel Fan-Out/Gather confirmed for medium query")
+        else:
+            await _cancel_speculative(speculative_task)
+            selected_agent, selection_msg = _WF_TABLE.get(complexity, _WF_TABLE["medium"])
+            logger.info(selection_msg)
 
         # Step 3: Execute the selected workflow
         # ADK Pattern: run_async with session propagates state
-        await selected_agent.run_async(session, input=request.query)
+        if selected_agent is not None:
+            await selected_agent.run_async(session, input=request.query)
 
         # Extract results from session state
+        # The sequential pipeline's fused classify_and_plan agent stores
+        # both structures under one key
+        fused = session.state.get("classify_plan", {})
         final_response = session.state.get("final_response", "")
-        classification = session.state.get("classification", {})
-        strategy = session.state.get("strategy", {})
+        classification = session.state.get("classification") or fused.get("classification", {})
+        strategy = session.state.get("strategy") or fused.get("strategy", {})
         tool_results = session.state.get("tool_results", [])
         cost_meter = session.state.get("cost_meter")
 
         # Step 4: Content safety check
         # ADK Best Practice: Validate outputs before returning to users
-        allowed, reasons = await check_content_safety(final_response)
-        if not allowed:
-            raise HTTPException(
-                status_code=400,
-                detail=f"Content policy violation: {', '.join(reasons)}"
-            )
+        # Kick the check off concurrently with response assembly so the
+        # tail of the request is workflow + max(safety, build), not the sum
+        safety_task = asyncio.create_task(check_content_safety(final_response))
 
         # Build sources payload
-        sources_payload = []
-        for result in tool_results:
-            if result.get("status") != "success":
-                continue
-            sources_payload.append({
+        sources_payload = [
+            {
                 "tool": result.get("tool_name"),
                 "count": _result_count_for_response(result),
                 "latency_ms": result.get("latency_ms"),
                 "confidence": result.get("average_confidence"),
                 "context_items": result.get("context_items", [])
-            })
+            }
+            for result in tool_results
+            if result.get("status") == "success"
+        ]
 
         # Build response
         response = QueryResponse(
             answer=final_response,
             sources=sources_payload,
             cost=cost_meter.spent if cost_meter else 0.0,
-            latency_ms=(time.time() - start_time) * 1000,
+            latency_ms=(_now() - start_time) * 1000,
             classification=classification,
             strategy=strategy
         )
 
+        allowed, reasons = await safety_task
+        if not allowed:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Content policy violation: {', '.join(reasons)}"
+            )
+
         # Cache response
-        await cache_manager.set_response(query_hash, response.json())
+        # Fire-and-forget: the caller does not need to wait for cache
+        # write confirmation. orjson serializes once; both caches share
+        # the same bytes
+        response_bytes = orjson.dumps(response.dict())
+        _spawn_background(
+            _store_response(query_hash, request.tenant_id, query_vector, response_bytes)
+        )
 
+        if not inflight.done():
+            inflight.set_result(response)
         return response
 
-    except HTTPException:
+    except HTTPException as e:
+        if not inflight.done():
+            inflight.set_exception(e)
         raise
     except Exception as e:
         logger.error(f"Query processing error: {e}", exc_info=True)
-        raise HTTPException(
+        error = HTTPException(
             status_code=500,
             detail=f"Internal server error: {str(e)}"
         )
+        if not inflight.done():
+            inflight.set_exception(error)
+        raise error
+    finally:
+        # Leader cancellation surfaces as CancelledError, a BaseException
+        # the handlers above never see, so the shared future would be
+        # popped unresolved and deadlock every joined waiter. Cancelling
+        # it here propagates the cancellation to them instead.
+        if not inflight.done():
+            inflight.cancel()
+        _INFLIGHT.pop(query_hash, None)
+        # A speculative workflow abandoned by an error path must not
+        # outlive the session it writes into
+        await _cancel_speculative(speculative_task)
+        if spec_session is not None:
+            # A discarded speculative run may have drawn its own cost
+            # meter; after a merge the meter is shared with the main
+            # session and must only be released once, below
+            spec_meter = spec_session.state.get("cost_meter")
+            if spec_meter is not session.state.get("cost_meter"):
+                cost_meter_pool.release(spec_meter)
+            _release_session(spec_session)
+        if session is not None:
+            # Return the pooled cost meter once the response (and its
+            # cost reading) is complete
+            cost_meter_pool.release(session.state.get("cost_meter"))
+            _release_session(session)
+
+
+# Memoized health result: load balancers probe every few seconds, and
+# hammering Azure dependencies once per probe wastes money and rate limit
+_HEALTH_TTL = 5.0
+_last_health: Dict[str, Any] = {}
+_last_health_ts = 0.0
+
+
+def _reset_health_cache():
+    """Drop the memoized /health result so the next probe re-checks.
+
+    Used by tests that exercise both healthy and degraded outcomes
+    within one memoization window.
+    """
+    global _last_health, _last_health_ts
+    _last_health = {}
+    _last_health_ts = 0.0
+
+
+@app.post("/query/stream")
+async def process_query_stream(request: QueryRequest):
+    """
+    Streamed variant of /query emitting NDJSON events.
+
+    Events: {"type": "start"} as soon as the request is accepted,
+    one {"type": "partial", "source": ...} per tool source, then
+    {"type": "final", "response": ...} with the full answer, or
+    {"type": "error", ...} if the workflow or safety gate rejects.
+
+    The underlying ADK workflow yields the synthesized answer only on
+    completion, so partial events cover tool sources rather than raw
+    tokens; content safety is validated before the final event is sent.
+    Cache hits return a single final event so the contract is uniform.
+    """
+    async def event_stream():
+        yield orjson.dumps({"type": "start", "timestamp": _now()}) + b"\n"
+        try:
+            result = await process_query(request)
+        except HTTPException as e:
+            yield orjson.dumps(
+                {"type": "error", "status": e.status_code, "reason": str(e.detail)}
+            ) + b"\n"
+            return
+        if isinstance(result, Response):
+            # Cached payload: already-serialized JSON bytes
+            yield b'{"type":"final","response":' + bytes(result.body) + b'}\n'
+            return
+        for source in result.sources:
+            yield orjson.dumps({"type": "partial", "source": source}) + b"\n"
+        yield orjson.dumps({"type": "final", "response": result.dict()}) + b"\n"
+
+    return StreamingResponse(event_stream(), media_type="application/x-ndjson")
 
 
 @app.get("/health")
@@ -193,14 +463,27 @@ async def health_check():
     Returns:
         Dict with overall status and dependency health
     """
+    global _last_health, _last_health_ts
+    now = _now()
+    if _last_health and now - _last_health_ts < _HEALTH_TTL:
+        return _last_health
+
+    # Probe dependencies concurrently so /health latency is the max of
+    # the three round-trips instead of their sum
+    redis_ok, openai_ok, search_ok = await asyncio.gather(
+        _check_redis(),
+        _check_openai(),
+        _check_search(),
+        return_exceptions=True
+    )
     health_status = {
         "status": "healthy",
-        "timestamp": time.time(),
+        "timestamp": now,
         "version": "1.0.0",
         "dependencies": {
-            "redis": await _check_redis(),
-            "openai": await _check_openai(),
-            "search": await _check_search()
+            "redis": redis_ok is True,
+            "openai": openai_ok is True,
+            "search": search_ok is True
         }
     }
 
@@ -208,22 +491,85 @@ async def health_check():
     all_healthy = all(health_status["dependencies"].values())
     health_status["status"] = "healthy" if all_healthy else "degraded"
 
+    _last_health = health_status
+    _last_health_ts = now
     return health_status
 
 
+# In-flight request dedup: identical queries awaiting completion share
+# one workflow execution (see the singleflight block in process_query)
+_INFLIGHT: Dict[str, asyncio.Future] = {}
+
+# Session object pool: reusing Session instances avoids the per-request
+# ADK bookkeeping allocations, which add up to real GC pressure at high
+# QPS. State and event history are cleared on acquire so nothing leaks
+# between requests.
+_SESSION_POOL: "asyncio.Queue[Session]" = asyncio.Queue(maxsize=64)
+
+
+def _acquire_session(user_id: str) -> Session:
+    """Get a pooled Session reset for the given user, or a fresh one"""
+    try:
+        session = _SESSION_POOL.get_nowait()
+        session.user_id = user_id
+        session.state.clear()
+        # Events accumulate per run_async; left in place they grow
+        # without bound and expose prior requests' queries to the next
+        # tenant that draws this session from the pool
+        session.events.clear()
+        return session
+    except asyncio.QueueEmpty:
+        return Session(user_id=user_id)
+
+
+def _release_session(session: Session):
+    """Return a Session to the pool; drop it if the pool is full"""
+    try:
+        _SESSION_POOL.put_nowait(session)
+    except asyncio.QueueFull:
+        pass
+
+
+# Background tasks need a strong reference until they finish or the
+# event loop may garbage-collect them mid-flight
+_BACKGROUND_TASKS: set = set()
+
+
+def _spawn_background(coro):
+    """Run a coroutine as a fire-and-forget task"""
+    task = asyncio.create_task(coro)
+    _BACKGROUND_TASKS.add(task)
+    task.add_done_callback(_BACKGROUND_TASKS.discard)
+    return task
+
+
+async def _store_response(query_hash: str, tenant_id: str, query_vector, response_bytes: bytes):
+    """Write a finished response to the exact and semantic caches"""
+    try:
+        await cache_manager.set_response(query_hash, response_bytes, tenant_id=tenant_id)
+        if query_vector is not None:
+            await semantic_cache.set(tenant_id, query_vector, response_bytes)
+    except Exception as e:
+        logger.warning(f"Response cache store failed: {e}")
+
+
 # Helper functions
+async def _cancel_speculative(task):
+    """Cancel and drain an abandoned speculative workflow task"""
+    if task is None or task.done():
+        return
+    task.cancel()
+    try:
+        await task
+    except asyncio.CancelledError:
+        pass
+    except Exception as e:
+        logger.debug(f"Speculative workflow raised after cancellation: {e}")
+
+
 def _result_count_for_response(result: Dict[str, Any]) -> int:
-    """Count results from tool response"""
-    tool_name = result.get("tool_name")
-    if tool_name == "azure_ai_search":
-        return len(result.get("docs", []))
-    if tool_name == "synapse_sql":
-        return len(result.get("rows", []))
-    if tool_name == "cosmos_gremlin":
-        return result.get("count", 0)
-    if tool_name == "web_search":
-        return len(result.get("results", []))
-    return result.get("count", 0)
+    """Count results from tool response via the shared dispatch table"""
+    return RESULT_COUNTERS.get(result.get("tool_name"), _default_result_count)(result)
 
 
 async def _check_redis() -> bool:
@@ -240,12 +586,10 @@ async def _check_redis() -> bool:
 async def _check_openai() -> bool:
     """Check OpenAI connectivity"""
     try:
-        response = get_clients().openai_client.chat.completions.create(
-            model=config.GPT4O_MINI_DEPLOYMENT,
-            messages=[{"role": "user", "content": "test"}],
-            max_tokens=1
-        )
-        return response.choices[0].message.content is not None
+        # models.list is a metadata call - it proves auth and reachability
+        # without burning a chat completion on every probe
+        await get_clients().openai_client.models.list()
+        return True
     except Exception as e:
         logger.error(f"OpenAI health check failed: {e}")
         return False
@@ -61,6 +61,10 @@ class Config:
         "AZURE_CONTENT_SAFETY_ENDPOINT",
         "https://<tenant>-safety.cognitiveservices.azure.com/"
     )
+    # Optional local pre-filter: path to a quantized ONNX text classifier
+    # plus its tokenizer file; empty disables the local fast path
+    LOCAL_SAFETY_MODEL_PATH: str = os.getenv("LOCAL_SAFETY_MODEL_PATH", "")
+    LOCAL_SAFETY_TOKENIZER_PATH: str = os.getenv("LOCAL_SAFETY_TOKENIZER_PATH", "")
 
     # Bing Search
     BING_SEARCH_KEY: str = os.getenv("BING_SEARCH_KEY", "")
@@ -78,6 +82,18 @@ class Config:
     TIMEOUT_WEB: float = float(os.getenv("TIMEOUT_WEB", "2.0"))
     TIMEOUT_TOTAL: float = float(os.getenv("TIMEOUT_TOTAL", "5.0"))
 
+    # Concurrency - ADK Best Practice: Bound parallel fan-out to avoid bursts
+    MAX_PARALLEL_TOOLS: int = int(os.getenv("MAX_PARALLEL_TOOLS", "4"))
+
+    # Fuse classifier + planner into one LLM call on the sequential
+    # pipeline; disable for A/B comparison against the split agents
+    FUSE_CLASSIFY_PLAN: bool = os.getenv("FUSE_CLASSIFY_PLAN", "true").lower() == "true"
+
+    # Caching - classification is stable per query text, so repeats can
+    # skip the classifier LLM call; NO_CACHE disables it for A/B runs
+    CLASSIFIER_CACHE_TTL: int = int(os.getenv("CLASSIFIER_CACHE_TTL", "86400"))
+    NO_CACHE: bool = os.getenv("NO_CACHE", "false").lower() == "true"
+
     # Quality gates - ADK Best Practice: Define quality thresholds for agent outputs
     MIN_RESULTS: int = int(os.getenv("MIN_RESULTS", "2"))
     MIN_CONFIDENCE: float = float(os.getenv("MIN_CONFIDENCE", "0.6"))
@@ -2,17 +2,37 @@
 Core infrastructure for Azure RAG Agent
 """
 from .clients import AzureClients, get_clients
-from .cache import CacheManager, cache_manager
+from .cache import CacheManager, cache_manager, cache_key
+from .semantic_cache import SemanticResponseCache, semantic_cache
+from .embedding_batcher import EmbeddingBatcher, embedding_batcher
 from .circuit_breaker import CircuitBreaker, BreakerState, circuit_breaker
-from .cost_tracking import CostMeter
+from .http import get_http_client, close_http_client
+from .llm_clients import get_llm
+from .gremlin_pool import GremlinClientPool, gremlin_pool
+from .synapse_pool import SynapseConnectionPool, synapse_pool
+from .cost_tracking import CostMeter, CostMeterPool, cost_meter_pool
 
 __all__ = [
     "AzureClients",
     "get_clients",
     "CacheManager",
     "cache_manager",
+    "cache_key",
+    "SemanticResponseCache",
+    "semantic_cache",
+    "EmbeddingBatcher",
+    "embedding_batcher",
     "CircuitBreaker",
     "BreakerState",
     "circuit_breaker",
+    "get_http_client",
+    "close_http_client",
+    "get_llm",
+    "GremlinClientPool",
+    "gremlin_pool",
+    "SynapseConnectionPool",
+    "synapse_pool",
     "CostMeter",
+    "CostMeterPool",
+    "cost_meter_pool",
 ]
@@ -3,13 +3,65 @@ Multi-layer caching strategy for Azure RAG Agent
 Implements ADK best practice for tool result caching to reduce costs
 """
 import logging
-from typing import Optional, Dict
-import json
+from collections import OrderedDict
+from hashlib import blake2b as _blake2b
+from time import monotonic as _monotonic
+from typing import Any, Optional, Dict, Union
+import numpy as np
+import orjson
+import zstandard as zstd
 
 from .clients import get_clients
+from ..config import config
 
 logger = logging.getLogger(__name__)
 
+# Responses with context_items run to tens of KB; zstd level 3 gets
+# 3-5x on JSON for <1ms per 10KB, cutting Redis memory and TLS
+# bandwidth. Small payloads are stored raw - compression overhead
+# outweighs the savings below this size.
+_ZSTD_MIN_SIZE = 4096
+_ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+_ZC = zstd.ZstdCompressor(level=3)
+_ZD = zstd.ZstdDecompressor()
+
+
+def cache_key(*parts: str) -> str:
+    """
+    Hash key components into a 32-hex-char cache key.
+
+    Feeds each part into the hasher incrementally with a separator byte,
+    so no intermediate joined string is allocated - on multi-KB queries
+    the f-string-then-encode pattern costs an allocation the size of the
+    whole query per request.
+    """
+    h = _blake2b(digest_size=16)
+    update = h.update
+    for part in parts:
+        update(b"\x1f")
+        update(part if isinstance(part, bytes) else part.encode())
+    return h.hexdigest()
+
+
+# Semantic-cache vectors are stored packed as fp16: half the Redis
+# bytes of fp32 with no practical effect on cosine at the hit threshold
+_VECTOR_DTYPE = np.float16
+_SEMANTIC_ID_BYTES = 16
+
+
+def _maybe_compress(data: bytes) -> bytes:
+    """Compress payloads above the size threshold"""
+    if len(data) >= _ZSTD_MIN_SIZE:
+        return _ZC.compress(data)
+    return data
+
+
+def _maybe_decompress(data: bytes) -> bytes:
+    """Transparently decompress payloads written by _maybe_compress"""
+    if data[:4] == _ZSTD_MAGIC:
+        return _ZD.decompress(data)
+    return data
+
 
 class CacheManager:
     """
@@ -19,6 +71,9 @@ class CacheManager:
     redundant API calls and improve response times in agent workflows.
     """
 
+    # Entries kept per (tool, tenant) semantic cache list
+    _SEMANTIC_MAX_ENTRIES = 64
+
     def __init__(self):
         # TTL configuration per cache type (seconds)
         self.ttls = {
@@ -27,8 +82,34 @@ class CacheManager:
             "tool_azure_ai_search": 1800,    # 30 min for vector/text search
             "tool_synapse_sql": 300,         # 5 min for SQL results
             "tool_web_search": 600,          # 10 min for web results
-            "tool_cosmos_gremlin": 600       # 10 min for graph lookups
+            "tool_cosmos_gremlin": 600,      # 10 min for graph lookups
+            "tool_classifier": config.CLASSIFIER_CACHE_TTL,  # classification is stable
+            "embedding": 86400               # 24 h - deterministic per model
         }
+        # Tiny in-process L1 in front of Redis: a popular key fetched
+        # hundreds of times a minute pays the TLS round-trip once per
+        # second instead of once per request
+        self._l1: "OrderedDict[str, tuple]" = OrderedDict()
+        self._l1_ttl = 1.0
+        self._l1_max = 512
+
+    def _l1_get(self, key: str) -> Optional[Any]:
+        """Return a fresh L1 entry, dropping it if expired"""
+        hit = self._l1.get(key)
+        if hit is None:
+            return None
+        if _monotonic() - hit[0] >= self._l1_ttl:
+            del self._l1[key]
+            return None
+        self._l1.move_to_end(key)
+        return hit[1]
+
+    def _l1_set(self, key: str, value: Any):
+        """Store an L1 entry, evicting the least recently used over cap"""
+        self._l1[key] = (_monotonic(), value)
+        self._l1.move_to_end(key)
+        if len(self._l1) > self._l1_max:
+            self._l1.popitem(last=False)
 
     async def get_response(self, query_hash: str) -> Optional[str]:
         """
@@ -37,20 +118,38 @@ class CacheManager:
         ADK Best Practice: Cache complete responses to avoid
         re-executing entire agent workflows for identical queries.
         """
+        key = f"response:{query_hash}"
+        l1_hit = self._l1_get(key)
+        if l1_hit is not None:
+            return l1_hit
         redis_client = await get_clients().get_redis()
-        cached = await redis_client.get(f"response:{query_hash}")
+        # Batch the GET with a sliding-TTL refresh in one round-trip; on
+        # SSL-fronted Redis each RTT is 1-2ms, so this halves cache-hit
+        # latency versus get-then-expire
+        pipe = redis_client.pipeline(transaction=False)
+        pipe.get(key)
+        pipe.expire(key, self.ttls["response"])
+        cached, _ = await pipe.execute()
         if cached:
             logger.info(f"Response cache hit: {query_hash[:8]}")
-        return cached
+            payload = _maybe_decompress(cached)
+            self._l1_set(key, payload)
+            return payload
+        return None
 
-    async def set_response(self, query_hash: str, response: str):
+    async def set_response(self, query_hash: str, response: Union[str, bytes], tenant_id: Optional[str] = None):
         """Cache complete response"""
         redis_client = await get_clients().get_redis()
-        await redis_client.setex(
-            f"response:{query_hash}",
-            self.ttls["response"],
-            response
-        )
+        key = f"response:{query_hash}"
+        if isinstance(response, str):
+            response = response.encode()
+        # Batch the write with tenant key tracking so ingestion-time
+        # invalidation can drop a tenant's entries in O(1) lookups
+        pipe = redis_client.pipeline(transaction=False)
+        pipe.setex(key, self.ttls["response"], _maybe_compress(response))
+        if tenant_id:
+            pipe.sadd(f"tenant:{tenant_id}:cache_keys", key)
+        await pipe.execute()
         logger.info(f"Cached response: {query_hash[:8]}")
 
     async def get_tool_result(self, tool_name: str, params_hash: str) -> Optional[Dict]:
@@ -60,22 +159,150 @@ class CacheManager:
         ADK Best Practice: Cache individual tool results to enable
         partial cache hits in multi-tool agent workflows.
         """
-        redis_client = await get_clients().get_redis()
         key = f"tool:{tool_name}:{params_hash}"
+        l1_hit = self._l1_get(key)
+        if l1_hit is not None:
+            return l1_hit
+        redis_client = await get_clients().get_redis()
         cached = await redis_client.get(key)
         if cached:
             logger.info(f"Tool cache hit: {tool_name}:{params_hash[:8]}")
-            return json.loads(cached)
+            result = orjson.loads(_maybe_decompress(cached))
+            self._l1_set(key, result)
+            return result
         return None
 
     async def set_tool_result(self, tool_name: str, params_hash: str, result: Dict):
-        """Cache tool result with tool-specific TTL"""
+        """
+        Cache tool result with tool-specific TTL.
+
+        Large results (search docs, SQL rows, context_items) are zstd
+        compressed above the size threshold; Redis transfer time
+        dominates for these payloads, so halving the bytes roughly
+        halves cache-hit latency.
+        """
         redis_client = await get_clients().get_redis()
         key = f"tool:{tool_name}:{params_hash}"
         ttl = self.ttls.get(f"tool_{tool_name}", 600)
-        await redis_client.setex(key, ttl, json.dumps(result))
+        await redis_client.setex(key, ttl, _maybe_compress(orjson.dumps(result)))
         logger.info(f"Cached tool result: {tool_name}:{params_hash[:8]}")
 
+    async def get_embedding(self, model: str, query: str) -> Optional[list]:
+        """
+        Get a cached query embedding.
+
+        Keyed on (model, query) only - independent of tenant, top_k and
+        filters - so the vector is reused even when downstream search
+        parameters differ. Embeddings are deterministic for a fixed
+        model, hence the long TTL.
+        """
+        key = f"emb:{cache_key(model, query)}"
+        l1_hit = self._l1_get(key)
+        if l1_hit is not None:
+            return l1_hit
+        redis_client = await get_clients().get_redis()
+        cached = await redis_client.get(key)
+        if cached:
+            embedding = orjson.loads(cached)
+            self._l1_set(key, embedding)
+            return embedding
+        return None
+
+    async def set_embedding(self, model: str, query: str, embedding: list):
+        """Cache a query embedding for the model"""
+        redis_client = await get_clients().get_redis()
+        key = f"emb:{cache_key(model, query)}"
+        await redis_client.setex(key, self.ttls["embedding"], orjson.dumps(embedding))
+
+    async def get_semantic(
+        self,
+        tool_name: str,
+        tenant_id: str,
+        query_embedding: list,
+        threshold: float = 0.95
+    ) -> Optional[Dict]:
+        """
+        Semantic-similarity lookup above the exact-match tool cache.
+
+        ADK Best Practice: Paraphrased queries ("show me Q3 sales" vs
+        "display Q3 sales figures") miss exact keys; comparing query
+        embeddings recovers those hits. Callers should try the exact
+        key first and fall back here.
+
+        Only the packed vector index is scanned (one numpy matmul); the
+        tool payload is fetched in a second round-trip on a hit, so a
+        miss never pulls result docs/rows over the wire.
+        """
+        redis_client = await get_clients().get_redis()
+        entries = await redis_client.lrange(
+            self._semantic_index_key(tool_name, tenant_id),
+            0,
+            self._SEMANTIC_MAX_ENTRIES - 1,
+        )
+        if not entries:
+            return None
+        # Azure embeddings are unit-normalized, so dot product equals
+        # cosine similarity
+        matrix = np.frombuffer(
+            b"".join(entry[_SEMANTIC_ID_BYTES:] for entry in entries),
+            dtype=_VECTOR_DTYPE,
+        ).reshape(len(entries), -1).astype(np.float32)
+        scores = matrix @ np.asarray(query_embedding, dtype=np.float32)
+        best = int(np.argmax(scores))
+        if scores[best] < threshold:
+            return None
+        payload = await redis_client.get(
+            self._semantic_payload_key(
+                tool_name, tenant_id, entries[best][:_SEMANTIC_ID_BYTES].hex()
+            )
+        )
+        if payload is None:
+            # Payload expired out from under the index entry
+            return None
+        logger.info(
+            f"Semantic tool cache hit: {tool_name} (similarity={scores[best]:.3f})"
+        )
+        return orjson.loads(_maybe_decompress(payload))
+
+    async def set_semantic(
+        self,
+        tool_name: str,
+        tenant_id: str,
+        query_embedding: list,
+        result: Dict
+    ):
+        """Store a tool result with its query embedding for the tenant.
+
+        The payload is compressed through the same zstd path as the
+        exact-key tool cache and kept under its own key, so the vector
+        index stays small enough to scan on every exact-key miss.
+        """
+        redis_client = await get_clients().get_redis()
+        ttl = self.ttls.get(f"tool_{tool_name}", 600)
+        packed = np.asarray(query_embedding, dtype=_VECTOR_DTYPE).tobytes()
+        entry_id = _blake2b(packed, digest_size=_SEMANTIC_ID_BYTES).digest()
+        index_key = self._semantic_index_key(tool_name, tenant_id)
+        pipe = redis_client.pipeline(transaction=False)
+        pipe.setex(
+            self._semantic_payload_key(tool_name, tenant_id, entry_id.hex()),
+            ttl,
+            _maybe_compress(orjson.dumps(result)),
+        )
+        pipe.lpush(index_key, entry_id + packed)
+        pipe.ltrim(index_key, 0, self._SEMANTIC_MAX_ENTRIES - 1)
+        pipe.expire(index_key, ttl)
+        await pipe.execute()
+
+    @staticmethod
+    def _semantic_index_key(tool_name: str, tenant_id: str) -> str:
+        """Key for the packed vector index of a (tool, tenant) pair"""
+        return f"semtool:{tool_name}:{tenant_id}:idx"
+
+    @staticmethod
+    def _semantic_payload_key(tool_name: str, tenant_id: str, entry_id: str) -> str:
+        """Key holding one cached tool payload"""
+        return f"semtool:{tool_name}:{tenant_id}:{entry_id}"
+
     async def get_session(self, session_id: str) -> Optional[Dict]:
         """
         Get session context with automatic TTL extension.
@@ -90,7 +317,7 @@ class CacheManager:
             # Extend TTL on access (sliding expiration)
             await redis_client.expire(key, self.ttls["session"])
             logger.info(f"Session cache hit: {session_id}")
-            return json.loads(cached)
+            return orjson.loads(cached)
         return None
 
     async def set_session(self, session_id: str, context: Dict):
@@ -99,7 +326,7 @@ class CacheManager:
         await redis_client.setex(
             f"session:{session_id}",
             self.ttls["session"],
-            json.dumps(context)
+            orjson.dumps(context)
         )
         logger.info(f"Cached session: {session_id}")
 
@@ -10,11 +10,14 @@ from typing import Dict
 logger = logging.getLogger(__name__)
 
 
-@dataclass
+@dataclass(slots=True)
 class BreakerState:
     """
     Circuit breaker state for a single tool.
 
+    Slotted: state updates fire on every tool call, and slot attribute
+    access skips the per-instance __dict__.
+
     States:
     - closed: Normal operation, requests allowed
     - open: Tool failing, requests blocked
@@ -52,6 +55,8 @@ class CircuitBreaker:
         self.timeout = timeout
         self._tools: Dict[str, BreakerState] = {}
         self._alpha = 0.2  # EMA smoothing factor
+        # Precomputed decay so the per-call EMA update is one multiply
+        self._one_minus_alpha = 1.0 - self._alpha
 
     def is_closed(self, tool_name: str) -> bool:
         """
@@ -81,7 +86,7 @@ class CircuitBreaker:
         breaker.consecutive_failures = 0
 
         # Update failure rate with exponential moving average
-        breaker.failure_rate = (1 - self._alpha) * breaker.failure_rate
+        breaker.failure_rate *= self._one_minus_alpha
 
         # Close circuit if half-open and success
         if breaker.state == "half_open":
@@ -99,7 +104,7 @@ class CircuitBreaker:
         breaker.consecutive_failures += 1
 
         # Update failure rate with exponential moving average
-        breaker.failure_rate = (1 - self._alpha) * breaker.failure_rate + self._alpha
+        breaker.failure_rate = breaker.failure_rate * self._one_minus_alpha + self._alpha
 
         # Open circuit if threshold exceeded
         if breaker.failure_rate > self.threshold and breaker.state != "open":
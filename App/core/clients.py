@@ -3,11 +3,13 @@ Azure service clients singleton
 Follows ADK best practice for resource management and credential handling
 """
 import logging
+from collections import OrderedDict
+
 from azure.identity import DefaultAzureCredential
-from azure.search.documents import SearchClient
+from azure.search.documents.aio import SearchClient
 from azure.search.documents.indexes.aio import SearchIndexClient
 from azure.cosmos import CosmosClient
-from openai import AzureOpenAI
+from openai import AsyncAzureOpenAI
 from azure.ai.contentsafety import ContentSafetyClient
 import redis.asyncio as redis
 
@@ -25,6 +27,9 @@ class AzureClients:
     """
     _instance = None
 
+    # Cap on cached per-tenant SearchClients (LRU eviction beyond this)
+    _SEARCH_CLIENT_CACHE_SIZE = 256
+
     def __new__(cls):
         if cls._instance is None:
             cls._instance = super().__new__(cls)
@@ -39,7 +44,9 @@ class AzureClients:
         self.credential = DefaultAzureCredential()
 
         # Azure OpenAI client
-        self.openai_client = AzureOpenAI(
+        # Async variant: the sync client would block the event loop from
+        # inside async handlers and serialize concurrent requests
+        self.openai_client = AsyncAzureOpenAI(
             azure_endpoint=config.OPENAI_ENDPOINT,
             api_version=config.OPENAI_API_VERSION,
             azure_ad_token_provider=lambda: self.credential.get_token(
@@ -62,6 +69,9 @@ class AzureClients:
         # Redis (initialized async on first use)
         self._redis_client = None
 
+        # Per-tenant SearchClient cache (LRU, see get_search_client)
+        self._search_clients: "OrderedDict[tuple, SearchClient]" = OrderedDict()
+
         # Content Safety client
         self.content_safety_client = ContentSafetyClient(
             endpoint=config.CONTENT_SAFETY_ENDPOINT,
@@ -77,13 +87,25 @@ class AzureClients:
         initialization issues in sync contexts.
         """
         if self._redis_client is None:
-            self._redis_client = redis.Redis(
+            # Explicit blocking pool: bounded connections that requests
+            # wait on instead of erroring, periodic health checks on
+            # idle connections, and TCP keepalive for Azure's SSL
+            # frontends. RESP3 reduces reply framing, and the hiredis
+            # C parser is picked up automatically from requirements.
+            pool = redis.BlockingConnectionPool(
                 host=config.REDIS_HOST,
                 port=config.REDIS_PORT,
-                ssl=config.REDIS_SSL,
-                decode_responses=True
+                connection_class=redis.SSLConnection if config.REDIS_SSL else redis.Connection,
+                max_connections=32,
+                health_check_interval=30,
+                socket_keepalive=True,
+                # Raw bytes: cached payloads may be zstd-compressed, and
+                # orjson parses bytes directly without a decode pass
+                decode_responses=False,
+                protocol=3
             )
-            logger.info("Redis client initialized")
+            self._redis_client = redis.Redis(connection_pool=pool)
+            logger.info("Redis client initialized with blocking connection pool")
         return self._redis_client
 
     def get_search_client(self, tenant_id: str, index_suffix: str = "kb") -> SearchClient:
@@ -99,12 +121,24 @@ class AzureClients:
         Returns:
             SearchClient configured for the tenant's index
         """
-        index_name = f"{tenant_id}-{index_suffix}"
-        return SearchClient(
+        # LRU-cache clients per (tenant, index): constructing a
+        # SearchClient sets up a fresh HTTPS pool, so rebuilding one per
+        # request pays a TLS handshake on every search for hot tenants
+        key = (tenant_id, index_suffix)
+        client = self._search_clients.get(key)
+        if client is not None:
+            self._search_clients.move_to_end(key)
+            return client
+
+        client = SearchClient(
             endpoint=config.SEARCH_ENDPOINT,
-            index_name=index_name,
+            index_name=f"{tenant_id}-{index_suffix}",
             credential=self.credential
         )
+        self._search_clients[key] = client
+        if len(self._search_clients) > self._SEARCH_CLIENT_CACHE_SIZE:
+            self._search_clients.popitem(last=False)
+        return client
 
 
 # Global singleton instance
@@ -3,14 +3,16 @@ Cost tracking and budget enforcement
 Implements ADK best practice for cost control in agent systems
 """
 import logging
+import queue
+from collections import Counter
 from dataclasses import dataclass, field
-from typing import Dict
-import json
+from typing import Iterable, Tuple
+import orjson
 
 logger = logging.getLogger(__name__)
 
 
-@dataclass
+@dataclass(slots=True)
 class CostMeter:
     """
     Tracks costs per query for budget enforcement.
@@ -28,7 +30,22 @@ class CostMeter:
     spent: float = 0.0
     tool_calls: int = 0
     llm_calls: int = 0
-    breakdown: Dict[str, float] = field(default_factory=dict)
+    over_budget: bool = False
+    breakdown: Counter = field(default_factory=Counter)
+
+    def reset(self, limit: float):
+        """
+        Reset the meter for reuse on a new query.
+
+        ADK Best Practice: Pool per-query bookkeeping objects instead of
+        allocating fresh ones under high QPS.
+        """
+        self.limit = limit
+        self.spent = 0.0
+        self.tool_calls = 0
+        self.llm_calls = 0
+        self.over_budget = False
+        self.breakdown.clear()
 
     def charge(self, category: str, amount: float):
         """
@@ -42,16 +59,42 @@ class CostMeter:
             amount: Cost in USD
         """
         self.spent += amount
-        self.breakdown[category] = self.breakdown.get(category, 0) + amount
+        self.breakdown[category] += amount
+        if self.spent >= self.limit:
+            self.over_budget = True
+        self._log_state()
+
+    def charge_batch(self, items: Iterable[Tuple[str, float]]):
+        """
+        Add several costs at once with a single log line.
 
-        # Log cost meter updates for observability
-        logger.info('cost_meter %s', json.dumps({
-            "spent": self.spent,
-            "limit": self.limit,
-            "breakdown": self.breakdown,
-            "tool_calls": self.tool_calls,
-            "llm_calls": self.llm_calls
-        }))
+        Charges land hundreds of times per query; batching callers pay
+        the serialization and logging cost once per batch instead of
+        once per item.
+
+        Args:
+            items: Iterable of (category, amount) pairs
+        """
+        breakdown = self.breakdown
+        for category, amount in items:
+            self.spent += amount
+            breakdown[category] += amount
+        if self.spent >= self.limit:
+            self.over_budget = True
+        self._log_state()
+
+    def _log_state(self):
+        """Log the meter state, skipping serialization when INFO is off"""
+        # charge() runs on every tool/LLM call; guard so disabled
+        # logging costs one isEnabledFor check instead of a dict dump
+        if logger.isEnabledFor(logging.INFO):
+            logger.info('cost_meter %s', orjson.dumps({
+                "spent": self.spent,
+                "limit": self.limit,
+                "breakdown": self.breakdown,
+                "tool_calls": self.tool_calls,
+                "llm_calls": self.llm_calls
+            }).decode())
 
     def allow_tool(self, max_tools: int) -> bool:
         """
@@ -60,7 +103,7 @@ class CostMeter:
         ADK Best Practice: Enforce limits before tool execution
         to prevent budget overruns in complex agent workflows.
         """
-        return self.tool_calls < max_tools and self.spent < self.limit
+        return not self.over_budget and self.tool_calls < max_tools
 
     def allow_llm(self, max_llm: int) -> bool:
         """
@@ -69,4 +112,42 @@ class CostMeter:
         ADK Best Practice: Control LLM call count in addition to cost
         to prevent excessive iterations in agent loops.
         """
-        return self.llm_calls < max_llm and self.spent < self.limit
+        return not self.over_budget and self.llm_calls < max_llm
+
+
+class CostMeterPool:
+    """
+    Pool of reusable CostMeter instances.
+
+    ADK Best Practice: Avoid per-request allocation churn for hot-path
+    bookkeeping objects. Meters are acquired at query start, reset with
+    the query's budget limit, and released once the response is built.
+    """
+
+    def __init__(self, size: int = 64):
+        """
+        Initialize the pool.
+
+        Args:
+            size: Maximum number of idle meters retained for reuse
+        """
+        self._pool: "queue.SimpleQueue[CostMeter]" = queue.SimpleQueue()
+        self._size = size
+
+    def acquire(self, limit: float) -> CostMeter:
+        """Get a reset meter from the pool, allocating only when empty"""
+        try:
+            meter = self._pool.get_nowait()
+        except queue.Empty:
+            return CostMeter(limit=limit)
+        meter.reset(limit)
+        return meter
+
+    def release(self, meter: CostMeter):
+        """Return a meter for reuse; drop it if the pool is full"""
+        if meter is not None and self._pool.qsize() < self._size:
+            self._pool.put_nowait(meter)
+
+
+# Global cost meter pool instance
+cost_meter_pool = CostMeterPool()
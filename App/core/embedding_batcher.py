@@ -0,0 +1,141 @@
+"""
+Embedding micro-batcher for Azure RAG Agent
+Coalesces concurrent embedding requests into one Azure OpenAI call
+"""
+import asyncio
+import logging
+from typing import List, Tuple
+
+from .cache import cache_manager
+from .clients import get_clients
+from ..config import config
+
+logger = logging.getLogger(__name__)
+
+
+class EmbeddingBatcher:
+    """
+    Micro-batcher for query embeddings.
+
+    ADK Best Practice: Coalesce concurrent short requests into one API
+    call so per-call overhead (TLS, auth, HTTP framing) is amortized
+    across the batch. During a parallel fan-out, several tools can need
+    an embedding at the same instant; one batched call serves them all.
+
+    Pattern:
+    - Callers enqueue (text, future) pairs and await the future
+    - A background task drains the queue every few milliseconds, or
+      immediately when the pending batch is full
+    - One embeddings.create call resolves every future in the batch,
+      with token usage prorated by text length
+    """
+
+    def __init__(self, max_batch: int = 16, max_chars: int = 16000, flush_ms: float = 5.0):
+        """
+        Initialize batcher.
+
+        Args:
+            max_batch: Maximum texts per embeddings call
+            max_chars: Cap on summed text length per batch
+            flush_ms: Milliseconds to wait for batch-mates before flushing
+        """
+        self.max_batch = max_batch
+        self.max_chars = max_chars
+        self.flush_interval = flush_ms / 1000.0
+        self._queue: "asyncio.Queue[Tuple[str, asyncio.Future]]" = asyncio.Queue()
+        self._worker: asyncio.Task = None
+
+    async def embed(self, text: str) -> Tuple[List[float], float]:
+        """
+        Embed text, coalescing with concurrent callers.
+
+        Returns:
+            Tuple of (embedding vector, prorated cost in USD)
+        """
+        # Embeddings are deterministic per model, so a repeated query
+        # skips the API call entirely even when downstream parameters
+        # (tenant, top_k, filters) differ between callers
+        cached = await cache_manager.get_embedding(config.EMBEDDING_DEPLOYMENT, text)
+        if cached is not None:
+            return cached, 0.0
+        future = asyncio.get_running_loop().create_future()
+        # Enqueue before the liveness check: a worker whose idle timeout
+        # is firing right now either drains this item before exiting or
+        # has already cleared _worker, so the restart below always covers
+        # it and the future cannot be stranded on a dead worker's queue
+        self._queue.put_nowait((text, future))
+        if self._worker is None or self._worker.done():
+            self._worker = asyncio.create_task(self._run())
+        return await future
+
+    async def _run(self):
+        """Drain the queue in batches until it stays empty"""
+        while True:
+            try:
+                item = await asyncio.wait_for(self._queue.get(), timeout=1.0)
+            except asyncio.TimeoutError:
+                # Idle exit. No awaits in this block, so it is atomic on
+                # the event loop: anything enqueued while the timeout was
+                # firing is picked up by the continue, and once _worker
+                # is cleared with the queue empty, the next embed() call
+                # starts a fresh worker.
+                if not self._queue.empty():
+                    continue
+                self._worker = None
+                return
+            batch = [item]
+            total_chars = len(item[0])
+            # Give batch-mates a brief window to arrive, then top up
+            await asyncio.sleep(self.flush_interval)
+            while (
+                len(batch) < self.max_batch
+                and total_chars < self.max_chars
+                and not self._queue.empty()
+            ):
+                text, future = self._queue.get_nowait()
+                batch.append((text, future))
+                total_chars += len(text)
+            await self._flush(batch, total_chars)
+
+    async def _flush(self, batch, total_chars: int):
+        """Issue one embeddings call and resolve every waiting future"""
+        texts = [text for text, _ in batch]
+        try:
+            response = await get_clients().openai_client.embeddings.create(
+                model=config.EMBEDDING_DEPLOYMENT,
+                input=texts
+            )
+            # Track embedding cost: text-embedding-3-small ~$0.00002 per 1K tokens
+            total_tokens = (
+                response.usage.total_tokens
+                if hasattr(response, "usage")
+                else 100 * len(batch)
+            )
+            total_cost = (total_tokens / 1000) * 0.00002
+            for (text, future), data in zip(batch, response.data):
+                if future.done():
+                    continue
+                # Prorate token cost by text length within the batch
+                share = len(text) / total_chars if total_chars else 1.0 / len(batch)
+                future.set_result((data.embedding, total_cost * share))
+            if len(batch) > 1:
+                logger.info(f"Batched {len(batch)} embedding requests into one call")
+            try:
+                await asyncio.gather(*(
+                    cache_manager.set_embedding(
+                        config.EMBEDDING_DEPLOYMENT, text, data.embedding
+                    )
+                    for (text, _), data in zip(batch, response.data)
+                ))
+            except Exception as e:
+                # Callers already have their vectors; a failed cache
+                # write only costs a future recompute
+                logger.warning(f"Embedding cache write failed: {e}")
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+
+
+# Global embedding batcher instance
+embedding_batcher = EmbeddingBatcher()
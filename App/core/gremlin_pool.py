@@ -0,0 +1,86 @@
+"""
+Gremlin client pool for Azure RAG Agent
+Reuses per-tenant websocket clients across tool invocations
+"""
+import asyncio
+import logging
+import time
+from typing import Dict, Tuple
+
+from gremlin_python.driver import client as gremlin_client
+
+from .clients import get_clients
+from ..config import config
+
+logger = logging.getLogger(__name__)
+
+
+class GremlinClientPool:
+    """
+    Per-tenant Gremlin client pool.
+
+    ADK Best Practice: Pool expensive connections. Building a Gremlin
+    client costs a TLS + websocket handshake plus an Azure AD token
+    fetch - hundreds of milliseconds that dwarf a short graph
+    traversal. Clients are kept per tenant and rebuilt only when their
+    token nears expiry.
+    """
+
+    # Rebuild this many seconds before the AAD token actually expires
+    _TOKEN_SLACK = 300.0
+
+    def __init__(self):
+        self._clients: Dict[str, Tuple[gremlin_client.Client, float]] = {}
+        self._lock = asyncio.Lock()
+
+    async def acquire(self, tenant_id: str) -> gremlin_client.Client:
+        """
+        Get a warm client for the tenant, rebuilding on token expiry.
+
+        Returns:
+            Connected gremlin client for the tenant's graph collection
+        """
+        entry = self._clients.get(tenant_id)
+        if entry is not None and time.time() < entry[1] - self._TOKEN_SLACK:
+            return entry[0]
+
+        async with self._lock:
+            # Re-check under the lock; another task may have rebuilt it
+            entry = self._clients.get(tenant_id)
+            if entry is not None and time.time() < entry[1] - self._TOKEN_SLACK:
+                return entry[0]
+
+            if entry is not None:
+                self._close_quietly(entry[0], tenant_id)
+
+            token = await asyncio.to_thread(
+                get_clients().credential.get_token,
+                'https://cosmos.azure.com/.default'
+            )
+            new_client = gremlin_client.Client(
+                f"wss://{config.COSMOS_ENDPOINT.split('//')[1].split(':')[0]}.gremlin.cosmos.azure.com:443/",
+                'g',
+                username=f"/dbs/{config.COSMOS_DATABASE}/colls/{tenant_id}-graph",
+                token=token
+            )
+            self._clients[tenant_id] = (new_client, float(token.expires_on))
+            logger.info(f"Gremlin client built for tenant {tenant_id}")
+            return new_client
+
+    def evict(self, tenant_id: str):
+        """Drop a tenant's client after a connection-level failure"""
+        entry = self._clients.pop(tenant_id, None)
+        if entry is not None:
+            self._close_quietly(entry[0], tenant_id)
+
+    @staticmethod
+    def _close_quietly(client: gremlin_client.Client, tenant_id: str):
+        """Close a client without letting teardown errors propagate"""
+        try:
+            client.close()
+        except Exception as e:
+            logger.warning(f"Error closing Gremlin client for {tenant_id}: {e}")
+
+
+# Global gremlin pool instance
+gremlin_pool = GremlinClientPool()
@@ -0,0 +1,50 @@
+"""
+Shared HTTP client for outbound tool calls
+Implements connection pooling and HTTP/2 multiplexing across tools
+"""
+import asyncio
+import logging
+from typing import Optional
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+_client: Optional[httpx.AsyncClient] = None
+_client_lock = asyncio.Lock()
+
+
+async def get_http_client() -> httpx.AsyncClient:
+    """
+    Get the process-wide pooled httpx.AsyncClient.
+
+    ADK Best Practice: Share one HTTP/2 connection pool across tools so
+    a parallel fan-out multiplexes requests over warm connections
+    instead of paying a TLS handshake per tool call.
+
+    Returns:
+        Shared httpx.AsyncClient with keepalive and HTTP/2 enabled
+    """
+    global _client
+    if _client is None:
+        async with _client_lock:
+            if _client is None:
+                _client = httpx.AsyncClient(
+                    http2=True,
+                    limits=httpx.Limits(
+                        max_connections=200,
+                        max_keepalive_connections=100
+                    ),
+                    timeout=httpx.Timeout(5.0, connect=2.0, read=15.0)
+                )
+                logger.info("Shared HTTP client initialized")
+    return _client
+
+
+async def close_http_client():
+    """Close the shared client; wired to application shutdown"""
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+        logger.info("Shared HTTP client closed")
@@ -0,0 +1,40 @@
+"""
+Shared LiteLlm wrappers for Azure OpenAI deployments
+Deduplicates LLM adapters across agents that share a deployment
+"""
+import logging
+from functools import lru_cache
+
+from google.adk.models.lite_llm import LiteLlm
+
+from ..config import config
+
+logger = logging.getLogger(__name__)
+
+
+@lru_cache(maxsize=None)
+def get_llm(deployment: str, stream: bool = False) -> LiteLlm:
+    """
+    Get the shared LiteLlm wrapper for an Azure OpenAI deployment.
+
+    ADK Best Practice: Reuse one LLM adapter per deployment across
+    agents. Classifier and reflection share GPT-4o-mini, planner and
+    synthesizer share GPT-4o; separate LiteLlm instances would mean
+    duplicated provider config and HTTP connection pools with no
+    cross-agent connection reuse.
+
+    Args:
+        deployment: Azure OpenAI deployment name
+        stream: Enable streaming responses for this wrapper
+
+    Returns:
+        Cached LiteLlm instance for the deployment
+    """
+    logger.info(f"Creating LiteLlm wrapper for deployment {deployment} (stream={stream})")
+    kwargs = {"stream": True} if stream else {}
+    return LiteLlm(
+        model=f"azure/{deployment}",
+        api_base=config.OPENAI_ENDPOINT,
+        api_version=config.OPENAI_API_VERSION,
+        **kwargs
+    )
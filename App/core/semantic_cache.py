@@ -0,0 +1,141 @@
+"""
+Semantic response cache for Azure RAG Agent
+Implements embedding-similarity lookup to short-circuit agent workflows
+"""
+import logging
+from hashlib import blake2b as _blake2b
+from typing import List, Optional, Union
+
+import numpy as np
+
+from .cache import _maybe_compress, _maybe_decompress
+from .clients import get_clients
+from ..config import config
+
+logger = logging.getLogger(__name__)
+
+# Vectors are stored packed as fp16: half the Redis bytes of fp32 and a
+# tenth of the JSON float list they replaced, with no practical effect
+# on cosine scores at a 0.9 hit threshold
+_VECTOR_DTYPE = np.float16
+_ID_BYTES = 16
+
+
+class SemanticResponseCache:
+    """
+    Embedding-similarity cache for final responses.
+
+    ADK Best Practice: Check for semantically similar answered queries
+    before dispatching to the agent workflow. A hit skips the classifier,
+    planner, executor, and synthesizer LLM calls entirely, returning a
+    cached response in milliseconds.
+
+    Pattern:
+    - Embed the incoming query with the Azure embedding deployment
+    - Compare against recent entries for the same tenant (cosine)
+    - Return the cached response when similarity exceeds the threshold
+
+    Vectors live in a compact binary index (one packed fp16 embedding
+    per entry) separate from the response payloads, so the miss path
+    pulls kilobytes of vectors and one matmul instead of megabytes of
+    response JSON scanned in Python. Payloads are zstd compressed via
+    the shared cache helpers and fetched only on a hit.
+
+    Entries are namespaced per tenant so cached answers never leak
+    across tenant boundaries.
+    """
+
+    def __init__(self, threshold: float = 0.9, max_entries: int = 128, ttl: int = 3600):
+        """
+        Initialize semantic cache.
+
+        Args:
+            threshold: Minimum cosine similarity for a hit (0.0-1.0)
+            max_entries: Maximum cached entries per tenant
+            ttl: Seconds before a tenant's cache expires
+        """
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self.ttl = ttl
+
+    async def embed_query(self, query: str) -> List[float]:
+        """
+        Embed the query with the configured Azure embedding deployment.
+
+        The caller keeps the vector so a miss can store it without
+        paying for a second embedding call.
+        """
+        response = await get_clients().openai_client.embeddings.create(
+            model=config.EMBEDDING_DEPLOYMENT,
+            input=query
+        )
+        return response.data[0].embedding
+
+    async def get(self, tenant_id: str, query_vector: List[float]) -> Optional[bytes]:
+        """
+        Look up a semantically similar cached response for the tenant.
+
+        Scans only the packed vector index; the response payload is
+        fetched in a second round-trip only when a hit clears the
+        threshold.
+
+        Returns:
+            Cached response JSON bytes on a hit, None on a miss
+        """
+        redis_client = await get_clients().get_redis()
+        entries = await redis_client.lrange(self._index_key(tenant_id), 0, self.max_entries - 1)
+        if not entries:
+            return None
+        # One matmul over the stacked fp16 matrix replaces a pure-Python
+        # dot product per entry. Azure embeddings are unit-normalized,
+        # so the dot product equals cosine similarity
+        matrix = np.frombuffer(
+            b"".join(entry[_ID_BYTES:] for entry in entries),
+            dtype=_VECTOR_DTYPE,
+        ).reshape(len(entries), -1).astype(np.float32)
+        scores = matrix @ np.asarray(query_vector, dtype=np.float32)
+        best = int(np.argmax(scores))
+        if scores[best] < self.threshold:
+            return None
+        payload = await redis_client.get(
+            self._payload_key(tenant_id, entries[best][:_ID_BYTES].hex())
+        )
+        if payload is None:
+            # Payload expired out from under the index entry
+            return None
+        logger.info(f"Semantic cache hit (similarity={scores[best]:.3f})")
+        return _maybe_decompress(payload)
+
+    async def set(self, tenant_id: str, query_vector: List[float], response: Union[str, bytes]):
+        """Cache a response with its query embedding for the tenant"""
+        redis_client = await get_clients().get_redis()
+        if isinstance(response, str):
+            response = response.encode()
+        packed = np.asarray(query_vector, dtype=_VECTOR_DTYPE).tobytes()
+        entry_id = _blake2b(packed, digest_size=_ID_BYTES).digest()
+        index_key = self._index_key(tenant_id)
+        # Payload and index entry written in one round-trip; evicted or
+        # expired payloads age out via their own TTL
+        pipe = redis_client.pipeline(transaction=False)
+        pipe.setex(
+            self._payload_key(tenant_id, entry_id.hex()),
+            self.ttl,
+            _maybe_compress(response),
+        )
+        pipe.lpush(index_key, entry_id + packed)
+        pipe.ltrim(index_key, 0, self.max_entries - 1)
+        pipe.expire(index_key, self.ttl)
+        await pipe.execute()
+        logger.info(f"Cached semantic entry for tenant {tenant_id}")
+
+    def _index_key(self, tenant_id: str) -> str:
+        """Build the tenant-scoped vector index key"""
+        return f"semcache:{tenant_id}:idx"
+
+    def _payload_key(self, tenant_id: str, entry_id: str) -> str:
+        """Build the key holding one cached response payload"""
+        return f"semcache:{tenant_id}:{entry_id}"
+
+
+# Global semantic cache instance
+semantic_cache = SemanticResponseCache()
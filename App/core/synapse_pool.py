@@ -0,0 +1,83 @@
+"""
+Synapse pyodbc connection pool for Azure RAG Agent
+Amortizes ODBC connect cost (TCP + TLS + AAD auth) across queries
+"""
+import asyncio
+import logging
+
+import pyodbc
+
+from ..config import config
+
+logger = logging.getLogger(__name__)
+
+
+class SynapseConnectionPool:
+    """
+    Bounded async pool of pyodbc connections.
+
+    ADK Best Practice: Pool expensive connections. An ODBC connect to
+    Synapse runs TCP + TLS + Azure AD auth (200-500ms), which dwarfs a
+    short analytics query; warm connections reduce that to zero.
+
+    Connections are recycled after a fixed number of uses so long-lived
+    sockets do not go stale behind Azure's idle timeouts.
+    """
+
+    def __init__(self, max_size: int = 8, max_uses: int = 500):
+        """
+        Initialize pool.
+
+        Args:
+            max_size: Maximum pooled connections
+            max_uses: Queries served before a connection is rebuilt
+        """
+        self.max_size = max_size
+        self.max_uses = max_uses
+        self._pool: "asyncio.Queue" = asyncio.Queue(maxsize=max_size)
+        self._created = 0
+        self._lock = asyncio.Lock()
+        self._uses: dict = {}
+
+    async def acquire(self):
+        """Get a warm connection, creating one if under the cap"""
+        try:
+            return self._pool.get_nowait()
+        except asyncio.QueueEmpty:
+            pass
+        async with self._lock:
+            if self._created < self.max_size:
+                self._created += 1
+                conn = await asyncio.to_thread(
+                    pyodbc.connect, config.SYNAPSE_DSN, autocommit=True
+                )
+                logger.info(f"Synapse connection created ({self._created}/{self.max_size})")
+                return conn
+        # Pool exhausted: wait for a connection to come back
+        return await self._pool.get()
+
+    async def release(self, conn):
+        """Return a connection, rebuilding it past its use budget"""
+        uses = self._uses.get(id(conn), 0) + 1
+        if uses >= self.max_uses:
+            await self.discard(conn)
+            return
+        self._uses[id(conn)] = uses
+        try:
+            self._pool.put_nowait(conn)
+        except asyncio.QueueFull:
+            await self.discard(conn)
+
+    async def discard(self, conn):
+        """Close a connection and free its pool slot"""
+        self._uses.pop(id(conn), None)
+        async with self._lock:
+            self._created = max(0, self._created - 1)
+        try:
+            await asyncio.to_thread(conn.close)
+        except Exception as e:
+            logger.warning(f"Error closing Synapse connection: {e}")
+
+
+# Global synapse pool instance
+synapse_pool = SynapseConnectionPool()
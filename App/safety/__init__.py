@@ -2,5 +2,10 @@
 Content safety module for Azure RAG Agent
 """
 from .content_safety import check_content_safety
+from .local_classifier import LocalSafetyClassifier, local_safety_classifier
 
-__all__ = ["check_content_safety"]
+__all__ = [
+    "check_content_safety",
+    "LocalSafetyClassifier",
+    "local_safety_classifier",
+]
@@ -0,0 +1,106 @@
+"""
+Optional local content-safety pre-filter
+Scores text with a quantized ONNX classifier before the cloud call
+"""
+import logging
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from ..config import config
+
+logger = logging.getLogger(__name__)
+
+# onnxruntime and tokenizers are optional: without them (or without a
+# configured model) every check escalates to Azure Content Safety
+try:
+    import onnxruntime as ort
+    from tokenizers import Tokenizer
+except ImportError:
+    ort = None
+    Tokenizer = None
+
+
+class LocalSafetyClassifier:
+    """
+    Local int8 ONNX toxicity classifier for the safety fast path.
+
+    ADK Best Practice: The cloud Content Safety RPC costs 50-200ms per
+    response. A quantized local classifier scores benign text in a few
+    milliseconds, so only borderline scores escalate to Azure.
+
+    The model is expected to emit one sigmoid score per category in
+    CATEGORIES order (export of a toxic-comment classifier quantized
+    with onnxruntime dynamic quantization).
+    """
+
+    CATEGORIES = ("hate", "self_harm", "sexual", "violence")
+
+    def __init__(self, model_path: str = "", tokenizer_path: str = ""):
+        self.model_path = model_path or config.LOCAL_SAFETY_MODEL_PATH
+        self.tokenizer_path = tokenizer_path or config.LOCAL_SAFETY_TOKENIZER_PATH
+        self._session = None
+        self._tokenizer = None
+        self._load_failed = False
+
+    @property
+    def available(self) -> bool:
+        """Whether the local fast path can score text"""
+        return bool(
+            ort is not None
+            and Tokenizer is not None
+            and self.model_path
+            and self.tokenizer_path
+            and not self._load_failed
+        )
+
+    def _ensure_loaded(self) -> bool:
+        """Lazily build the ONNX session and tokenizer"""
+        if self._session is not None:
+            return True
+        if not self.available:
+            return False
+        try:
+            options = ort.SessionOptions()
+            # Single-threaded: requests are scored one at a time and the
+            # event loop should not fight ORT for cores
+            options.intra_op_num_threads = 1
+            options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+            self._session = ort.InferenceSession(
+                self.model_path,
+                sess_options=options,
+                providers=["CPUExecutionProvider"]
+            )
+            self._tokenizer = Tokenizer.from_file(self.tokenizer_path)
+            logger.info("Local safety classifier loaded")
+            return True
+        except Exception as e:
+            logger.warning(f"Local safety classifier unavailable: {e}")
+            self._load_failed = True
+            return False
+
+    def score(self, text: str) -> Optional[Dict[str, float]]:
+        """
+        Score text locally.
+
+        Returns:
+            Dict of category -> score (0.0-1.0), or None when the local
+            model is unavailable and the caller must use the cloud API
+        """
+        if not self._ensure_loaded():
+            return None
+        try:
+            encoding = self._tokenizer.encode(text)
+            inputs = {
+                "input_ids": np.array([encoding.ids], dtype=np.int64),
+                "attention_mask": np.array([encoding.attention_mask], dtype=np.int64)
+            }
+            scores: List[float] = self._session.run(None, inputs)[0][0].tolist()
+            return dict(zip(self.CATEGORIES, scores))
+        except Exception as e:
+            logger.warning(f"Local safety scoring failed: {e}")
+            return None
+
+
+# Global local classifier instance
+local_safety_classifier = LocalSafetyClassifier()
@@ -4,13 +4,12 @@ Implements ADK BaseTool with best practices for RAG
 """
 import logging
 import time
-import hashlib
 from typing import Any, Dict, List
 
 from google.adk.tools import BaseTool
 from azure.search.documents.models import VectorizedQuery
 
-from ..core import get_clients, cache_manager
+from ..core import get_clients, cache_manager, cache_key, embedding_batcher
 from ..config import config
 
 logger = logging.getLogger(__name__)
@@ -57,7 +56,7 @@ class AzureAISearchTool(BaseTool):
         filters = kwargs.get("filters", None)
 
         # Check cache
-        params_hash = hashlib.md5(f"{query}:{tenant_id}:{top_k}".encode()).hexdigest()
+        params_hash = cache_key(query, tenant_id, str(top_k))
         cached = await cache_manager.get_tool_result(self.name, params_hash)
         if cached:
             logger.info(f"Cache hit for {self.name}: {params_hash[:8]}")
@@ -68,20 +67,16 @@ class AzureAISearchTool(BaseTool):
         try:
             search_client = get_clients().get_search_client(tenant_id)
 
-            # Generate embeddings
-            embedding_response = get_clients().openai_client.embeddings.create(
-                model=config.EMBEDDING_DEPLOYMENT,
-                input=query
-            )
-            query_vector = embedding_response.data[0].embedding
+            # Generate embeddings via the micro-batcher: concurrent tool
+            # invocations coalesce into one Azure OpenAI call, with the
+            # token cost prorated across the batch
+            query_vector, embedding_cost = await embedding_batcher.embed(query)
 
-            # Track embedding cost: text-embedding-3-small ~$0.00002 per 1K tokens
-            embedding_tokens = (
-                embedding_response.usage.total_tokens
-                if hasattr(embedding_response, 'usage')
-                else 100
-            )
-            embedding_cost = (embedding_tokens / 1000) * 0.00002
+            # Two-tier lookup: exact key missed above, so check for a
+            # semantically equivalent cached query before searching
+            semantic_hit = await cache_manager.get_semantic(self.name, tenant_id, query_vector)
+            if semantic_hit:
+                return semantic_hit
 
             # Create vector query
             vector_query = VectorizedQuery(
@@ -92,7 +87,7 @@ class AzureAISearchTool(BaseTool):
 
             # ADK + Azure Best Practice: Use semantic ranker for better relevance
             # Critical for sentiment analysis and opinion-based queries
-            results = search_client.search(
+            results = await search_client.search(
                 search_text=query,
                 vector_queries=[vector_query],
                 filter=filters,
@@ -102,10 +97,17 @@ class AzureAISearchTool(BaseTool):
                 select=["id", "content", "metadata", "tenant_id"]
             )
 
-            # Process results
+            # Process results in one fused pass: build docs and context
+            # items together and accumulate the score sum as we go,
+            # instead of re-walking the doc list per derived structure
             docs: List[Dict[str, Any]] = []
-            scores: List[float] = []
-            for doc in results:
+            context_items: List[Dict[str, Any]] = []
+            docs_append = docs.append
+            ctx_append = context_items.append
+            name = self.name
+            score_sum = 0.0
+            score_n = 0
+            async for doc in results:
                 # Use semantic reranker score if available (0-4 scale)
                 reranker_score = doc.get("@search.reranker_score")
                 search_score = doc.get("@search.score", 0)
@@ -113,36 +115,34 @@ class AzureAISearchTool(BaseTool):
                 score = float(
                     reranker_score / 4.0 if reranker_score is not None else search_score
                 )
+                doc_id = doc.get("id")
+                content = doc.get("content", "")
+                metadata = doc.get("metadata", {})
 
-                payload = {
-                    "id": doc.get("id"),
-                    "content": doc.get("content", ""),
+                docs_append({
+                    "id": doc_id,
+                    "content": content,
                     "score": score,
                     "reranker_score": reranker_score,
-                    "metadata": doc.get("metadata", {})
-                }
-                docs.append(payload)
-                scores.append(score)
+                    "metadata": metadata
+                })
+                ctx_append({
+                    "type": "text",
+                    "source": name,
+                    "id": doc_id,
+                    "content": content,
+                    "metadata": metadata,
+                    "score": score
+                })
+                score_sum += score
+                score_n += 1
 
-            avg_score = sum(scores) / len(scores) if scores else 0.0
+            avg_score = score_sum / score_n if score_n else 0.0
 
             # Calculate total cost: embedding + search
             search_cost = 0.0001  # Approximate AI Search cost per query
             cost = embedding_cost + search_cost
 
-            # Format context items for agent consumption
-            context_items = [
-                {
-                    "type": "text",
-                    "source": self.name,
-                    "id": doc.get("id"),
-                    "content": doc.get("content", ""),
-                    "metadata": doc.get("metadata", {}),
-                    "score": doc.get("score", 0)
-                }
-                for doc in docs
-            ]
-
             result = {
                 "status": "success",
                 "tool_name": self.name,
@@ -154,8 +154,9 @@ class AzureAISearchTool(BaseTool):
                 "context_items": context_items
             }
 
-            # Cache result
+            # Cache result under both the exact key and the query embedding
             await cache_manager.set_tool_result(self.name, params_hash, result)
+            await cache_manager.set_semantic(self.name, tenant_id, query_vector, result)
             return result
 
         except Exception as e:
@@ -4,18 +4,41 @@ Implements ADK BaseTool for knowledge graph queries
 """
 import logging
 import time
-import hashlib
 import asyncio
+from collections import OrderedDict
 from typing import Any, Dict, List, Tuple
 
 from google.adk.tools import BaseTool
-from gremlin_python.driver import client as gremlin_client
 
-from ..core import get_clients, cache_manager
+from ..core import get_clients, cache_manager, cache_key, embedding_batcher, gremlin_pool
 from ..config import config
 
 logger = logging.getLogger(__name__)
 
+# Stable NL-to-Gremlin system prompt: fixed prefix so Azure OpenAI's
+# prompt cache can reuse the prefill across requests
+_NL2GREMLIN_SYSTEM_PROMPT = """Convert the user's question to a single Gremlin traversal query.
+Return only the query - no explanations, no markdown fences.
+
+Rules:
+- Limit traversal depth to 3 hops.
+- Always bound result size with .limit(50) or tighter.
+- Use valueMap(true) when node properties are needed.
+
+Examples:
+Q: what is connected to the billing service
+A: g.V().has('name','billing-service').both().limit(50).valueMap(true)
+
+Q: impact of database X going down
+A: g.V().has('name','database-X').in('depends_on').repeat(__.in('depends_on')).times(2).emit().dedup().limit(50).valueMap(true)
+
+Q: services related to the payments team
+A: g.V().has('team','payments').bothE().otherV().dedup().limit(50).valueMap(true)"""
+
+# Memoized NL-to-Gremlin translations: exact repeats skip the LLM call
+_GREMLIN_MEMO: "OrderedDict[str, str]" = OrderedDict()
+_GREMLIN_MEMO_MAX = 1024
+
 
 class CosmosGremlinTool(BaseTool):
     """
@@ -54,32 +77,39 @@ class CosmosGremlinTool(BaseTool):
         max_depth = kwargs.get("max_depth", 3)
 
         # Check cache
-        params_hash = hashlib.md5(f"{tenant_id}:{query}:{max_depth}".encode()).hexdigest()
+        params_hash = cache_key(tenant_id, query, str(max_depth))
         cached = await cache_manager.get_tool_result(self.name, params_hash)
         if cached:
             logger.info(f"Cache hit for {self.name}: {params_hash[:8]}")
             return cached
 
         try:
+            # Two-tier lookup: on an exact-key miss, check whether a
+            # paraphrase of this query already has a cached result. The
+            # batched embedder keeps the extra lookup to one cheap call.
+            query_embedding, _ = await embedding_batcher.embed(query)
+            semantic_hit = await cache_manager.get_semantic(self.name, tenant_id, query_embedding)
+            if semantic_hit:
+                return semantic_hit
+
             # Convert NL to Gremlin using LLM
             gremlin_query, llm_cost = await self._nl_to_gremlin(query)
 
-            # Create Gremlin client
-            graph_client = gremlin_client.Client(
-                f"wss://{config.COSMOS_ENDPOINT.split('//')[1].split(':')[0]}.gremlin.cosmos.azure.com:443/",
-                'g',
-                username=f"/dbs/{config.COSMOS_DATABASE}/colls/{tenant_id}-graph",
-                token=await asyncio.to_thread(
-                    get_clients().credential.get_token,
-                    'https://cosmos.azure.com/.default'
-                )
-            )
+            # Pooled client: skips the per-request websocket handshake
+            # and AAD token fetch for warm tenants
+            graph_client = await gremlin_pool.acquire(tenant_id)
 
-            # Execute query
+            # Execute query; submit().all().result() blocks, so run it
+            # in a worker thread to keep the event loop free
             try:
-                results = graph_client.submit(gremlin_query).all().result()
-            finally:
-                graph_client.close()
+                results = await asyncio.to_thread(
+                    lambda: graph_client.submit(gremlin_query).all().result()
+                )
+            except Exception:
+                # A dead websocket poisons the pooled client; evict it so
+                # the next call rebuilds the connection
+                gremlin_pool.evict(tenant_id)
+                raise
 
             # Normalize results for agent consumption
             normalized = self._normalize_results(results)
@@ -100,8 +130,9 @@ class CosmosGremlinTool(BaseTool):
                 "context_items": normalized.get("context_items", [])
             }
 
-            # Cache result
+            # Cache result under both the exact key and the query embedding
             await cache_manager.set_tool_result(self.name, params_hash, payload)
+            await cache_manager.set_semantic(self.name, tenant_id, query_embedding, payload)
             return payload
 
         except Exception as e:
@@ -124,17 +155,23 @@ class CosmosGremlinTool(BaseTool):
         ADK Best Practice: Use small, fast LLM for query translation
         to minimize cost and latency in tool execution.
         """
-        response = get_clients().openai_client.chat.completions.create(
+        memo_key = " ".join(query.lower().split())
+        cached_gremlin = _GREMLIN_MEMO.get(memo_key)
+        if cached_gremlin is not None:
+            _GREMLIN_MEMO.move_to_end(memo_key)
+            return cached_gremlin, 0.0
+
+        response = await get_clients().openai_client.chat.completions.create(
             model=config.GPT4O_MINI_DEPLOYMENT,
             messages=[
-                {
-                    "role": "system",
-                    "content": "Convert to Gremlin query. Return only the query, no explanations. Limit depth to 3 hops."
-                },
+                {"role": "system", "content": _NL2GREMLIN_SYSTEM_PROMPT},
                 {"role": "user", "content": query}
             ],
             temperature=0,
-            max_tokens=200
+            max_tokens=200,
+            # Pin the shared prefix in Azure OpenAI's prompt cache;
+            # prompt_cache_key is a request-body parameter, not a header
+            extra_body={"prompt_cache_key": "nl2gremlin-v1"}
         )
 
         # Track LLM cost: GPT-4o-mini ~$0.00015 input, $0.0006 output per 1K tokens
@@ -146,7 +183,45 @@ class CosmosGremlinTool(BaseTool):
                 (usage.completion_tokens / 1000 * 0.0006)
             )
 
-        return response.choices[0].message.content.strip(), llm_cost
+        gremlin_query = response.choices[0].message.content.strip()
+        _GREMLIN_MEMO[memo_key] = gremlin_query
+        if len(_GREMLIN_MEMO) > _GREMLIN_MEMO_MAX:
+            _GREMLIN_MEMO.popitem(last=False)
+        return gremlin_query, llm_cost
+
+    def _to_vertex(self, item: Dict[str, Any], nodes: list, context_items: list):
+        """Append one vertex to nodes and context_items"""
+        node = {
+            "id": item.get('id'),
+            "label": item.get('label'),
+            "properties": item.get('properties', {})
+        }
+        nodes.append(node)
+        context_items.append({
+            "type": "graph:vertex",
+            "source": self.name,
+            "id": node["id"],
+            "content": str(node["properties"]),
+            "metadata": {"label": node["label"]}
+        })
+
+    def _to_edge(self, item: Dict[str, Any], edges: list, context_items: list):
+        """Append one edge to edges and context_items"""
+        edge = {
+            "id": item.get('id'),
+            "label": item.get('label'),
+            "outV": item.get('outV'),
+            "inV": item.get('inV'),
+            "properties": item.get('properties', {})
+        }
+        edges.append(edge)
+        context_items.append({
+            "type": "graph:edge",
+            "source": self.name,
+            "id": edge["id"],
+            "content": f"{edge['outV']} -[{edge['label']}]-> {edge['inV']}",
+            "metadata": edge["properties"]
+        })
 
     def _normalize_results(self, raw: List[Any]) -> Dict[str, Any]:
         """
@@ -154,42 +229,25 @@ class CosmosGremlinTool(BaseTool):
 
         ADK Best Practice: Transform tool outputs into consistent
         structure for agent consumption (context_items pattern).
+
+        Dispatches on the Gremlin 'type' field through a dict instead of
+        chained isinstance/get checks - large traversals return thousands
+        of items and the loop is iteration-bound.
         """
         nodes: List[Dict[str, Any]] = []
         edges: List[Dict[str, Any]] = []
         context_items: List[Dict[str, Any]] = []
 
+        dispatch = {
+            'vertex': (self._to_vertex, nodes),
+            'edge': (self._to_edge, edges)
+        }
         for item in raw or []:
-            if isinstance(item, dict) and item.get('type') == 'vertex':
-                node = {
-                    "id": item.get('id'),
-                    "label": item.get('label'),
-                    "properties": item.get('properties', {})
-                }
-                nodes.append(node)
-                context_items.append({
-                    "type": "graph:vertex",
-                    "source": self.name,
-                    "id": node.get('id'),
-                    "content": str(node.get('properties', {})),
-                    "metadata": {"label": node.get('label')}
-                })
-            elif isinstance(item, dict) and item.get('type') == 'edge':
-                edge = {
-                    "id": item.get('id'),
-                    "label": item.get('label'),
-                    "outV": item.get('outV'),
-                    "inV": item.get('inV'),
-                    "properties": item.get('properties', {})
-                }
-                edges.append(edge)
-                context_items.append({
-                    "type": "graph:edge",
-                    "source": self.name,
-                    "id": edge.get('id'),
-                    "content": f"{edge.get('outV')} -[{edge.get('label')}]-> {edge.get('inV')}",
-                    "metadata": edge.get('properties', {})
-                })
+            if not isinstance(item, dict):
+                continue
+            handler = dispatch.get(item.get('type'))
+            if handler is not None:
+                handler[0](item, handler[1], context_items)
 
         count = len(nodes) + len(edges)
         avg_conf = 0.7 if count else 0.0
@@ -2,19 +2,63 @@
 Synapse SQL analytics tool
 Implements ADK BaseTool for data warehouse queries
 """
+import asyncio
 import logging
 import time
-import hashlib
+from collections import OrderedDict
 from typing import Any, Dict, List, Tuple
 
 from google.adk.tools import BaseTool
-import pyodbc
 
-from ..core import get_clients, cache_manager
+from ..core import get_clients, cache_manager, cache_key, embedding_batcher, synapse_pool
 from ..config import config
 
 logger = logging.getLogger(__name__)
 
+# Stable NL-to-SQL system prompt: a fixed prefix with no per-tenant
+# interpolation, so Azure OpenAI's prompt cache can reuse the prefill
+# across requests and tenants. The tenant is passed in the user turn.
+_NL2SQL_SYSTEM_PROMPT = """Convert the user's question to a single T-SQL query for Azure Synapse.
+Return only the query - no explanations, no markdown fences.
+
+Rules:
+- Use ANSI T-SQL compatible with Synapse serverless SQL pools.
+- Never modify data; generate SELECT statements only.
+- Prefer explicit column lists over SELECT *.
+- Include a tenant_id column in the result set when available.
+
+Examples:
+Q: total sales by region for Q3
+A: SELECT region, SUM(amount) AS total_sales FROM sales WHERE quarter = 'Q3' GROUP BY region
+
+Q: top 10 customers by revenue this year
+A: SELECT TOP 10 customer_id, SUM(revenue) AS total_revenue FROM orders WHERE YEAR(order_date) = YEAR(GETDATE()) GROUP BY customer_id ORDER BY total_revenue DESC
+
+Q: average order value per month
+A: SELECT MONTH(order_date) AS order_month, AVG(order_total) AS avg_order_value FROM orders GROUP BY MONTH(order_date)"""
+
+# Memoized NL-to-SQL translations: exact-match repeats skip the LLM call
+_SQL_MEMO: "OrderedDict[Tuple[str, str], str]" = OrderedDict()
+_SQL_MEMO_MAX = 1024
+
+# Column types that are already JSON serializable and pass through as-is
+_PASSTHROUGH_TYPES = (str, int, float, bool)
+
+
+def _pick_converter(type_code):
+    """
+    Choose a per-column JSON sanitizer from the pyodbc type code.
+
+    Returns None for passthrough columns; callers skip the call entirely
+    for those, which is the common case.
+    """
+    if type_code in _PASSTHROUGH_TYPES:
+        return None
+    if type_code in (bytes, bytearray):
+        return lambda value: value.hex()
+    # datetime, date, Decimal, UUID, etc. all stringify cleanly
+    return str
+
 
 class SynapseSQLTool(BaseTool):
     """
@@ -53,13 +97,21 @@ class SynapseSQLTool(BaseTool):
         limit = kwargs.get("limit", 1000)
 
         # Check cache
-        params_hash = hashlib.md5(f"{tenant_id}:{query}:{limit}".encode()).hexdigest()
+        params_hash = cache_key(tenant_id, query, str(limit))
         cached = await cache_manager.get_tool_result(self.name, params_hash)
         if cached:
             logger.info(f"Cache hit for {self.name}: {params_hash[:8]}")
             return cached
 
         try:
+            # Two-tier lookup: on an exact-key miss, check whether a
+            # paraphrase of this query already has a cached result. The
+            # batched embedder keeps the extra lookup to one cheap call.
+            query_embedding, _ = await embedding_batcher.embed(query)
+            semantic_hit = await cache_manager.get_semantic(self.name, tenant_id, query_embedding)
+            if semantic_hit:
+                return semantic_hit
+
             # Convert NL to SQL using LLM
             sql, llm_cost = await self._nl_to_sql(query, tenant_id)
 
@@ -71,37 +123,24 @@ class SynapseSQLTool(BaseTool):
                 f") AS base_query WHERE tenant_id = ?"
             )
 
-            # Execute SQL
-            conn = pyodbc.connect(config.SYNAPSE_DSN, autocommit=True)
-            cursor = conn.cursor()
-
+            # Execute SQL on a pooled connection; the blocking ODBC work
+            # runs in a worker thread so the event loop stays free
+            conn = await synapse_pool.acquire()
             try:
-                cursor.execute(wrapped_sql, tenant_id)
-                columns = [column[0] for column in cursor.description]
-                raw_rows = cursor.fetchall()
-            finally:
-                cursor.close()
-                conn.close()
-
-            # Sanitize rows for JSON serialization
-            rows = [self._sanitize_row(columns, row) for row in raw_rows]
+                columns, rows, context_items = await asyncio.to_thread(
+                    self._execute_blocking, conn, wrapped_sql, tenant_id, self.name
+                )
+            except Exception:
+                # A failed connection must not return to the pool
+                await synapse_pool.discard(conn)
+                raise
+            else:
+                await synapse_pool.release(conn)
 
             # Total cost: LLM for NL2SQL + SQL execution
             sql_execution_cost = min(0.0005, 0.00005 * max(len(rows), 1))
             cost = llm_cost + sql_execution_cost
 
-            # Format context items for agent consumption
-            context_items = [
-                {
-                    "type": "table-row",
-                    "source": self.name,
-                    "id": str(idx),
-                    "content": ", ".join(f"{col}={row[col]}" for col in columns),
-                    "metadata": row
-                }
-                for idx, row in enumerate(rows, 1)
-            ]
-
             payload = {
                 "status": "success",
                 "tool_name": self.name,
@@ -114,8 +153,9 @@ class SynapseSQLTool(BaseTool):
                 "context_items": context_items
             }
 
-            # Cache result
+            # Cache result under both the exact key and the query embedding
             await cache_manager.set_tool_result(self.name, params_hash, payload)
+            await cache_manager.set_semantic(self.name, tenant_id, query_embedding, payload)
             return payload
 
         except Exception as e:
@@ -131,6 +171,59 @@ class SynapseSQLTool(BaseTool):
                 "context_items": []
             }
 
+    # Rows pulled from the driver per fetchmany round-trip
+    _FETCH_BATCH = 500
+
+    @staticmethod
+    def _execute_blocking(
+        conn, sql: str, tenant_id: str, tool_name: str
+    ) -> Tuple[tuple, List[Dict[str, Any]], List[Dict[str, Any]]]:
+        """
+        Run the query on a pooled connection (called in a thread).
+
+        Streams rows with fetchmany instead of fetchall, and builds the
+        sanitized row dict and its context_item in the same pass - the
+        fetchall-then-rows-then-context_items pattern held three copies
+        of a large result set in memory at its peak.
+
+        Sanitizes rows for JSON serialization using per-column converters
+        built once from cursor.description, instead of an isinstance
+        chain per cell - 1000 rows x 20 columns otherwise pays 20k type
+        checks of pure interpreter overhead.
+        """
+        cursor = conn.cursor()
+        try:
+            cursor.execute(sql, tenant_id)
+            description = cursor.description
+            columns = tuple(column[0] for column in description)
+            converters = [_pick_converter(column[1]) for column in description]
+            rows: List[Dict[str, Any]] = []
+            context_items: List[Dict[str, Any]] = []
+            rows_append = rows.append
+            ctx_append = context_items.append
+            idx = 0
+            while True:
+                batch = cursor.fetchmany(SynapseSQLTool._FETCH_BATCH)
+                if not batch:
+                    break
+                for raw in batch:
+                    row = {
+                        col: value if conv is None or value is None else conv(value)
+                        for col, conv, value in zip(columns, converters, raw)
+                    }
+                    rows_append(row)
+                    idx += 1
+                    ctx_append({
+                        "type": "table-row",
+                        "source": tool_name,
+                        "id": str(idx),
+                        "content": ", ".join(f"{col}={row[col]}" for col in columns),
+                        "metadata": row
+                    })
+            return columns, rows, context_items
+        finally:
+            cursor.close()
+
     async def _nl_to_sql(self, query: str, tenant_id: str) -> Tuple[str, float]:
         """
         Convert natural language to SQL using GPT-4o-mini.
@@ -138,17 +231,23 @@ class SynapseSQLTool(BaseTool):
         ADK Best Practice: Use small LLM for query translation
         to minimize cost in tool execution.
         """
-        response = get_clients().openai_client.chat.completions.create(
+        memo_key = (tenant_id, " ".join(query.lower().split()))
+        cached_sql = _SQL_MEMO.get(memo_key)
+        if cached_sql is not None:
+            _SQL_MEMO.move_to_end(memo_key)
+            return cached_sql, 0.0
+
+        response = await get_clients().openai_client.chat.completions.create(
             model=config.GPT4O_MINI_DEPLOYMENT,
             messages=[
-                {
-                    "role": "system",
-                    "content": f"Convert to SQL query for tenant {tenant_id}. Return only the query."
-                },
-                {"role": "user", "content": query}
+                {"role": "system", "content": _NL2SQL_SYSTEM_PROMPT},
+                {"role": "user", "content": f"Tenant: {tenant_id}\n{query}"}
             ],
             temperature=0,
-            max_tokens=300
+            max_tokens=300,
+            # Pin the shared prefix in Azure OpenAI's prompt cache;
+            # prompt_cache_key is a request-body parameter, not a header
+            extra_body={"prompt_cache_key": f"nl2sql-v1-{tenant_id}"}
         )
 
         # Track LLM cost: GPT-4o-mini ~$0.00015 input, $0.0006 output per 1K tokens
@@ -160,19 +259,8 @@ class SynapseSQLTool(BaseTool):
                 (usage.completion_tokens / 1000 * 0.0006)
             )
 
-        return response.choices[0].message.content.strip(), llm_cost
-
-    def _sanitize_row(self, columns: List[str], row: Tuple[Any, ...]) -> Dict[str, Any]:
-        """
-        Ensure rows are JSON serializable for caching.
-
-        ADK Best Practice: Normalize tool outputs to JSON-compatible
-        types for caching and agent consumption.
-        """
-        sanitized: Dict[str, Any] = {}
-        for column, value in zip(columns, row):
-            if isinstance(value, (str, int, float, bool)) or value is None:
-                sanitized[column] = value
-            else:
-                sanitized[column] = str(value)
-        return sanitized
+        sql = response.choices[0].message.content.strip()
+        _SQL_MEMO[memo_key] = sql
+        if len(_SQL_MEMO) > _SQL_MEMO_MAX:
+            _SQL_MEMO.popitem(last=False)
+        return sql, llm_cost
@@ -4,16 +4,20 @@ Implements ADK BaseTool for external information retrieval
 """
 import logging
 import time
-import hashlib
 from typing import Any, Dict
 
 from google.adk.tools import BaseTool
 
-from ..core import cache_manager
+from ..core import cache_manager, cache_key, get_http_client
 from ..config import config
 
 logger = logging.getLogger(__name__)
 
+# Static auth header built once; the shared pooled client is used by
+# other tools too, so the Bing key stays per-request rather than a
+# client-wide default
+_BING_HEADERS = {"Ocp-Apim-Subscription-Key": config.BING_SEARCH_KEY}
+
 
 class WebSearchTool(BaseTool):
     """
@@ -50,22 +54,22 @@ class WebSearchTool(BaseTool):
         max_results = kwargs.get("max_results", 10)
 
         # Check cache
-        params_hash = hashlib.md5(f"{query}:{max_results}".encode()).hexdigest()
+        params_hash = cache_key(query, str(max_results))
         cached = await cache_manager.get_tool_result(self.name, params_hash)
         if cached:
             logger.info(f"Cache hit for {self.name}: {params_hash[:8]}")
             return cached
 
         try:
-            import httpx
-
-            async with httpx.AsyncClient() as client:
-                response = await client.get(
-                    "https://api.bing.microsoft.com/v7.0/search",
-                    headers={"Ocp-Apim-Subscription-Key": config.BING_SEARCH_KEY},
-                    params={"q": query, "count": max_results},
-                    timeout=config.TIMEOUT_WEB
-                )
+            # Shared pooled client: no per-call TLS handshake, and the
+            # parallel fan-out multiplexes over warm connections
+            client = await get_http_client()
+            response = await client.get(
+                "https://api.bing.microsoft.com/v7.0/search",
+                headers=_BING_HEADERS,
+                params={"q": query, "count": max_results},
+                timeout=config.TIMEOUT_WEB
+            )
 
             data = response.json()
 
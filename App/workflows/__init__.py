@@ -1,12 +1,13 @@
 """
 ADK workflow patterns for Azure RAG Agent
 """
-from .sequential import create_sequential_pipeline
+from .sequential import create_sequential_pipeline, create_direct_lookup_pipeline
 from .parallel import create_parallel_fanout_gather
 from .iterative import create_iterative_refinement
 
 __all__ = [
     "create_sequential_pipeline",
+    "create_direct_lookup_pipeline",
     "create_parallel_fanout_gather",
     "create_iterative_refinement",
 ]
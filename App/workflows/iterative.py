@@ -8,13 +8,14 @@ from google.adk.agents import SequentialAgent, LoopAgent
 from google.adk.tools import BaseTool
 
 from ..agents import (
-    create_classifier_agent,
+    CachingClassifierAgent,
     create_planner_agent,
     create_synthesizer_agent,
     create_reflection_agent,
     ToolExecutionAgent,
     QualityGateAgent,
     QualityCheckerAgent,
+    ResidualPlannerAgent,
 )
 from ..config import config
 
@@ -30,11 +31,12 @@ def create_iterative_refinement(tools: Dict[str, BaseTool]) -> SequentialAgent:
     1. Classify query
     2. Plan initial strategy
     3. Enter refinement loop:
-       a. Execute tools
-       b. Validate quality (deterministic)
-       c. Reflect on sufficiency (LLM-based)
-       d. Check if sufficient (escalate to exit loop)
-       e. If insufficient, continue loop with refined strategy
+       a. Narrow the plan to unresolved tools (residual pass)
+       b. Execute tools
+       c. Validate quality and merge findings (deterministic)
+       d. Reflect on sufficiency (LLM-based)
+       e. Check if sufficient (escalate to exit loop)
+       f. If insufficient, continue loop on the remaining gap
     4. Synthesize final response
 
     Key ADK Concepts:
@@ -54,7 +56,8 @@ def create_iterative_refinement(tools: Dict[str, BaseTool]) -> SequentialAgent:
         description="Iterate until sufficient quality",
         max_iterations=config.MAX_REPLAN_ITERATIONS,
         sub_agents=[
-            ToolExecutionAgent(tools),
+            ResidualPlannerAgent(),  # Narrows later passes to unresolved tools
+            ToolExecutionAgent(tools, default_execution_mode="parallel"),
             QualityGateAgent(),
             create_reflection_agent(),
             QualityCheckerAgent()  # Escalates to exit loop when quality sufficient
@@ -66,7 +69,7 @@ def create_iterative_refinement(tools: Dict[str, BaseTool]) -> SequentialAgent:
         name="RAGIterativePipeline",
         description="RAG with iterative refinement for complex queries",
         sub_agents=[
-            create_classifier_agent(),
+            CachingClassifierAgent(),
             create_planner_agent(),
             refinement_loop,
             create_synthesizer_agent()
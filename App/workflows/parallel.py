@@ -8,7 +8,7 @@ from google.adk.agents import SequentialAgent
 from google.adk.tools import BaseTool
 
 from ..agents import (
-    create_classifier_agent,
+    CachingClassifierAgent,
     create_planner_agent,
     create_synthesizer_agent,
     ToolExecutionAgent,
@@ -16,7 +16,7 @@ from ..agents import (
 )
 
 
-def create_parallel_fanout_gather(tools: Dict[str, BaseTool]) -> SequentialAgent:
+def create_parallel_fanout_gather(tools: Dict[str, BaseTool], with_classifier: bool = True) -> SequentialAgent:
     """
     Create parallel fan-out/gather pipeline for medium complexity queries.
 
@@ -38,17 +38,21 @@ def create_parallel_fanout_gather(tools: Dict[str, BaseTool]) -> SequentialAgent
 
     Args:
         tools: Dictionary of available tools
+        with_classifier: Include the classifier stage. The speculative
+            path in the API runs a standalone classifier concurrently,
+            so its variant skips this stage to avoid issuing two
+            classifier LLM calls for one query
 
     Returns:
         SequentialAgent configured for medium complexity queries
     """
+    lead_agents = [CachingClassifierAgent()] if with_classifier else []
     return SequentialAgent(
-        name="RAGParallelPipeline",
+        name="RAGParallelPipeline" if with_classifier else "RAGSpeculativeParallelPipeline",
         description="RAG with parallel tool execution for medium complexity",
-        sub_agents=[
-            create_classifier_agent(),
+        sub_agents=lead_agents + [
             create_planner_agent(),
-            ToolExecutionAgent(tools),  # Executes in parallel based on strategy
+            ToolExecutionAgent(tools, default_execution_mode="parallel"),
             QualityGateAgent(),
             create_synthesizer_agent()
         ]
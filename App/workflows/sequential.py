@@ -9,11 +9,13 @@ from google.adk.tools import BaseTool
 
 from ..agents import (
     create_classifier_agent,
+    create_classify_and_plan_agent,
     create_planner_agent,
     create_synthesizer_agent,
     ToolExecutionAgent,
     QualityGateAgent,
 )
+from ..config import config
 
 
 def create_sequential_pipeline(tools: Dict[str, BaseTool]) -> SequentialAgent:
@@ -24,11 +26,16 @@ def create_sequential_pipeline(tools: Dict[str, BaseTool]) -> SequentialAgent:
     where each agent depends on the previous agent's output.
 
     Pattern:
-    1. Classify query (intent, complexity, domain)
-    2. Plan execution strategy (tools, mode)
-    3. Execute tools sequentially
-    4. Validate quality gates
-    5. Synthesize final response
+    1. Classify query and plan strategy in one fused LLM call
+    2. Execute tools sequentially
+    3. Validate quality gates
+    4. Synthesize final response
+
+    The classifier and planner are fused into a single GPT-4o-mini call
+    here: simple queries dominate this pipeline, so removing one full
+    LLM round trip cuts its critical-path latency substantially. Set
+    FUSE_CLASSIFY_PLAN=false to fall back to the split agents for A/B
+    comparison.
 
     Args:
         tools: Dictionary of available tools
@@ -36,12 +43,45 @@ def create_sequential_pipeline(tools: Dict[str, BaseTool]) -> SequentialAgent:
     Returns:
         SequentialAgent configured for simple query processing
     """
+    if config.FUSE_CLASSIFY_PLAN:
+        ingest_agents = [create_classify_and_plan_agent()]
+    else:
+        ingest_agents = [create_classifier_agent(), create_planner_agent()]
     return SequentialAgent(
         name="RAGSequentialPipeline",
         description="Sequential RAG pipeline for simple queries",
+        sub_agents=ingest_agents + [
+            ToolExecutionAgent(tools),
+            QualityGateAgent(),
+            create_synthesizer_agent()
+        ]
+    )
+
+
+def create_direct_lookup_pipeline(tools: Dict[str, BaseTool]) -> SequentialAgent:
+    """
+    Create fast-path pipeline for simple lookup queries.
+
+    ADK Best Practice: Skip LLM planning entirely when the classification
+    already determines the plan. Simple lookups are answered by a single
+    hybrid search, so the caller injects the strategy into session state
+    and this pipeline goes straight to execution and synthesis.
+
+    Pattern:
+    1. Execute tools per the pre-seeded direct strategy
+    2. Validate quality gates
+    3. Synthesize final response
+
+    Args:
+        tools: Dictionary of available tools
+
+    Returns:
+        SequentialAgent with no planning stage for direct lookups
+    """
+    return SequentialAgent(
+        name="RAGDirectLookupPipeline",
+        description="Planner-free RAG fast path for simple lookups",
         sub_agents=[
-            create_classifier_agent(),
-            create_planner_agent(),
             ToolExecutionAgent(tools),
             QualityGateAgent(),
             create_synthesizer_agent()
@@ -8,14 +8,33 @@ import time
 from typing import Optional
 
 import httpx
-from azure.identity import DefaultAzureCredential
+from azure.identity import ChainedTokenCredential
 from azure.cosmos import CosmosClient, PartitionKey
 
+from az_credential import get_credential
+
 LOGGER = logging.getLogger(__name__)
 API_VERSION = "2023-11-15"
 MGMT_SCOPE = "https://management.azure.com/.default"
 COSMOS_SQL_SCOPE = "https://cosmos.azure.com/.default"
 
+# Shared client: provisioning plus polling reuses one keep-alive
+# connection instead of a TLS handshake per call
+HTTP_CLIENT = httpx.Client(timeout=30, limits=httpx.Limits(max_keepalive_connections=8))
+
+# Tokens cached per scope and refreshed shortly before expiry, so
+# multi-graph runs and poll loops stop hammering the token endpoint
+_TOKEN_CACHE: dict = {}
+_TOKEN_SLACK_SECONDS = 300
+
+
+def get_bearer_token(credential: ChainedTokenCredential, scope: str) -> str:
+    cached = _TOKEN_CACHE.get(scope)
+    if cached is None or cached.expires_on - time.time() < _TOKEN_SLACK_SECONDS:
+        cached = credential.get_token(scope)
+        _TOKEN_CACHE[scope] = cached
+    return cached.token
+
 
 def parse_args() -> argparse.Namespace:
     parser = argparse.ArgumentParser(description=__doc__)
@@ -33,7 +52,7 @@ def parse_args() -> argparse.Namespace:
     return parser.parse_args()
 
 
-def ensure_sql_container(endpoint: str, database_id: str, container_id: str, throughput: int, credential: DefaultAzureCredential) -> None:
+def ensure_sql_container(endpoint: str, database_id: str, container_id: str, throughput: int, credential: ChainedTokenCredential) -> None:
     LOGGER.info("Ensuring SQL container %s in database %s", container_id, database_id)
     client = CosmosClient(endpoint, credential=credential, consistency_level="Session")
     database = client.create_database_if_not_exists(id=database_id, throughput=throughput)
@@ -42,14 +61,14 @@ def ensure_sql_container(endpoint: str, database_id: str, container_id: str, thr
     LOGGER.info("SQL container %s ready", container_id)
 
 
-def ensure_gremlin_graph(subscription_id: str, resource_group: str, account_name: str, database_id: str, graph_id: str, throughput: int, credential: DefaultAzureCredential) -> None:
+def ensure_gremlin_graph(subscription_id: str, resource_group: str, account_name: str, database_id: str, graph_id: str, throughput: int, credential: ChainedTokenCredential) -> None:
     if not subscription_id:
         raise ValueError("Subscription id is required for Gremlin graph provisioning")
 
     base_id = f"/subscriptions/{subscription_id}/resourceGroups/{resource_group}/providers/Microsoft.DocumentDB/databaseAccounts/{account_name}"
     request_url = f"https://management.azure.com{base_id}/gremlinDatabases/{database_id}/graphs/{graph_id}?api-version={API_VERSION}"
 
-    token = credential.get_token(MGMT_SCOPE).token
+    token = get_bearer_token(credential, MGMT_SCOPE)
     headers = {
         "Authorization": f"Bearer {token}",
         "Content-Type": "application/json"
@@ -75,22 +94,21 @@ def ensure_gremlin_graph(subscription_id: str, resource_group: str, account_name
     }
 
     LOGGER.info("Ensuring Gremlin graph %s in database %s", graph_id, database_id)
-    with httpx.Client(timeout=30) as client:
-        response = client.put(request_url, headers=headers, json=payload)
-        if response.status_code == 409:
-            LOGGER.info("Graph %s already exists", graph_id)
-            return
-        if response.status_code in (200, 201):
-            LOGGER.info("Graph %s created", graph_id)
-            return
-        if response.status_code == 202:
-            poll_url = response.headers.get("Azure-AsyncOperation") or response.headers.get("Location")
-            if not poll_url:
-                response.raise_for_status()
-            wait_for_completion(client, poll_url, headers)
-            LOGGER.info("Graph %s created", graph_id)
-            return
-        response.raise_for_status()
+    response = HTTP_CLIENT.put(request_url, headers=headers, json=payload)
+    if response.status_code == 409:
+        LOGGER.info("Graph %s already exists", graph_id)
+        return
+    if response.status_code in (200, 201):
+        LOGGER.info("Graph %s created", graph_id)
+        return
+    if response.status_code == 202:
+        poll_url = response.headers.get("Azure-AsyncOperation") or response.headers.get("Location")
+        if not poll_url:
+            response.raise_for_status()
+        wait_for_completion(HTTP_CLIENT, poll_url, headers)
+        LOGGER.info("Graph %s created", graph_id)
+        return
+    response.raise_for_status()
 
 
 def wait_for_completion(client: httpx.Client, poll_url: str, headers: dict, interval: int = 5, timeout: int = 300) -> None:
@@ -113,7 +131,7 @@ def main() -> None:
     args = parse_args()
     logging.basicConfig(level=logging.DEBUG if args.verbose else logging.INFO, format="%(levelname)s %(message)s")
 
-    credential = DefaultAzureCredential()
+    credential = get_credential()
 
     ensure_sql_container(
         endpoint=args.endpoint,
@@ -1,11 +1,12 @@
 import pytest
 from unittest.mock import patch
 
-@pytest.fixture(autouse=True)
+@pytest.fixture(autouse=True, scope="session")
 def mock_azure_clients():
     """
     This fixture automatically patches the AzureClients class for all tests,
-    preventing any actual calls to Azure services.
+    preventing any actual calls to Azure services. Session-scoped: one
+    patch for the whole run instead of a setup/teardown cycle per test.
     """
     with patch("App.core.clients.AzureClients") as mock:
-        yield mock
\ No newline at end of file
+        yield mock
@@ -1,22 +1,62 @@
+import importlib
+from contextlib import ExitStack
+
 import pytest
 from unittest.mock import patch, AsyncMock
 from fastapi.testclient import TestClient
 
 # Thanks to conftest.py, AzureClients is already patched.
 # We can now safely import the app at the module level.
-from App.api.app import app
+# Note: App/api/__init__.py re-exports the FastAPI instance as `app`,
+# shadowing the submodule - both `from App.api import app` and
+# `import App.api.app as m` would bind the FastAPI object, so the
+# fixtures below would poke dead attributes. Resolve the module itself.
+app_module = importlib.import_module("App.api.app")
+app = app_module.app
 
 # A single TestClient instance can be reused.
-client = TestClient(app)
+client = TestClient(app, raise_server_exceptions=False)
+
+
+@pytest.fixture(scope="module")
+def health_probes():
+    """
+    Patch the three dependency probes once per module instead of
+    re-entering three patch contexts for every parametrized case.
+    Yields (redis, openai, search) mocks; tests set return values.
+    """
+    with ExitStack() as stack:
+        mocks = tuple(
+            stack.enter_context(patch(target, new_callable=AsyncMock))
+            for target in (
+                "App.api.app._check_redis",
+                "App.api.app._check_openai",
+                "App.api.app._check_search",
+            )
+        )
+        yield mocks
+
+
+@pytest.fixture(autouse=True)
+def reset_health_memo(health_probes):
+    """
+    /health memoizes probe results for a few seconds; every test here
+    sets its own probe values, so drop the memo before each case. The
+    probe mocks are module-scoped, so their configured values and call
+    history are reset here too to keep cases independent.
+    """
+    app_module._reset_health_cache()
+    for mock in health_probes:
+        mock.reset_mock(return_value=True)
+    yield
+
 
-@patch("App.api.app._check_search", new_callable=AsyncMock)
-@patch("App.api.app._check_openai", new_callable=AsyncMock)
-@patch("App.api.app._check_redis", new_callable=AsyncMock)
-def test_health_check_healthy(mock_check_redis, mock_check_openai, mock_check_search):
+def test_health_check_healthy(health_probes):
     """
     Test the /health endpoint when all dependencies are healthy.
     """
     # Arrange
+    mock_check_redis, mock_check_openai, mock_check_search = health_probes
     mock_check_redis.return_value = True
     mock_check_openai.return_value = True
     mock_check_search.return_value = True
@@ -42,17 +82,12 @@ def test_health_check_healthy(mock_check_redis, mock_check_openai, mock_check_se
         (False, False, False),
     ]
 )
-@patch("App.api.app._check_search", new_callable=AsyncMock)
-@patch("App.api.app._check_openai", new_callable=AsyncMock)
-@patch("App.api.app._check_redis", new_callable=AsyncMock)
-def test_health_check_degraded(
-    mock_check_redis, mock_check_openai, mock_check_search,
-    redis_status, openai_status, search_status
-):
+def test_health_check_degraded(health_probes, redis_status, openai_status, search_status):
     """
     Test the /health endpoint when any dependency is unhealthy.
     """
     # Arrange
+    mock_check_redis, mock_check_openai, mock_check_search = health_probes
     mock_check_redis.return_value = redis_status
     mock_check_openai.return_value = openai_status
     mock_check_search.return_value = search_status
@@ -70,4 +105,4 @@ def test_health_check_degraded(
     assert response.status_code == 200
     data = response.json()
     assert data["status"] == "degraded"
-    assert data["dependencies"] == expected_dependencies
\ No newline at end of file
+    assert data["dependencies"] == expected_dependencies
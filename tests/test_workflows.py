@@ -0,0 +1,53 @@
+# Thanks to conftest.py, AzureClients is already patched.
+from App.tools import AzureAISearchTool, CosmosGremlinTool, SynapseSQLTool, WebSearchTool
+from App.workflows import (
+    create_direct_lookup_pipeline,
+    create_iterative_refinement,
+    create_parallel_fanout_gather,
+    create_sequential_pipeline,
+)
+
+
+def make_tools():
+    """Build a fresh tools dict, mirroring the table in App.api.app."""
+    return {
+        tool.name: tool(name=tool.name, description=tool.description)
+        for tool in (AzureAISearchTool, CosmosGremlinTool, SynapseSQLTool, WebSearchTool)
+    }
+
+
+def test_direct_lookup_pipeline_owns_its_sub_agents():
+    """
+    ADK enforces a single parent per agent instance, so the direct
+    lookup pipeline must not share gate/synthesizer instances with the
+    sequential pipeline it was derived from.
+    """
+    tools = make_tools()
+    direct = create_direct_lookup_pipeline(tools)
+    simple = create_sequential_pipeline(tools)
+
+    shared = {id(agent) for agent in direct.sub_agents} & {
+        id(agent) for agent in simple.sub_agents
+    }
+    assert not shared
+
+
+def test_all_pipelines_build_repeatedly():
+    """
+    App.api.app builds all four pipelines at module scope, and
+    App/agent.py builds the sequential pipeline again for the ADK CLI.
+    If any factory handed out a shared agent instance, the second build
+    would raise ADK's 'already has a parent agent' ValidationError.
+    """
+    tools = make_tools()
+    for _ in range(2):
+        create_direct_lookup_pipeline(tools)
+        create_sequential_pipeline(tools)
+        create_parallel_fanout_gather(tools)
+        create_iterative_refinement(tools)
+
+
+def test_api_module_imports():
+    """The workflow table is built at import; a shared-instance bug
+    would make this import (and therefore the whole app) fail."""
+    import App.api.app  # noqa: F401